@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""
+Example running many cached screens concurrently with asyncio.
+
+This example shows how to:
+1. Issue several screens at once with CachedScreenRunAPI.async_run_simple_screen
+2. Compare the concurrent wall-clock time against the cached re-run
+"""
+import asyncio
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from p123api_client import CachedScreenRunAPI
+from p123api_client.cache import CacheConfig
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Set up a custom cache path in the examples directory
+CACHE_PATH = Path(__file__).parent / "async_cache_example.db"
+
+FORMULAS = [f"PRICE > {price}" for price in range(50, 550, 25)]
+
+
+def print_separator(title):
+    """Print a section separator with title."""
+    print("\n" + "=" * 80)
+    print(f" {title} ".center(80, " "))
+    print("=" * 80 + "\n")
+
+
+async def run_all(api, universe):
+    """Run every example formula concurrently and return the results."""
+    return await asyncio.gather(
+        *[api.async_run_simple_screen(universe=universe, formula=f) for f in FORMULAS]
+    )
+
+
+async def main():
+    """Run the example script."""
+    print_separator("Async Caching Example")
+    api = CachedScreenRunAPI(cache_config=CacheConfig(db_path=str(CACHE_PATH)))
+    universe = "SP500"
+
+    # First pass - screens not yet cached are fetched concurrently
+    print_separator(f"Running {len(FORMULAS)} Screens Concurrently")
+    start_time = time.perf_counter_ns()
+    results = await run_all(api, universe)
+    first_pass_time = (time.perf_counter_ns() - start_time) / 1e9
+
+    for formula, result in zip(FORMULAS, results, strict=True):
+        print(f"{formula}: {len(result)} stocks")
+    print(f"\nFirst pass execution time: {first_pass_time:.2f} seconds")
+
+    # Second pass - every screen is served from the cache
+    print_separator("Running Again (Cache Hits)")
+    start_time = time.perf_counter_ns()
+    await run_all(api, universe)
+    second_pass_time = (time.perf_counter_ns() - start_time) / 1e9
+    print(f"Second pass execution time: {second_pass_time:.2f} seconds")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -23,6 +23,7 @@ load_dotenv()
 
 # Set up a custom cache path in the examples directory
 CACHE_PATH = Path(__file__).parent / "easy_cache_example.db"
+CACHE_PATH_STR = os.fspath(CACHE_PATH)
 
 def print_separator(title):
     """Print a section separator with title."""
@@ -44,37 +45,37 @@ def main():
     
     # First call with regular API (no caching)
     print_separator("Regular API Call (No Caching)")
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     result1 = regular_api.run_simple_screen(
         universe=universe,
         formula=formula,
         as_dataframe=True
     )
-    regular_call_time = time.time() - start_time
+    regular_call_time = (time.perf_counter_ns() - start_time) / 1e9
     
     # Print results
     print(f"Found {len(result1)} stocks matching criteria")
     print(f"Regular API call execution time: {regular_call_time:.2f} seconds")
     print("\nSample results:")
-    print(result1.head())
+    print(result1.iloc[:5])
     
     # Now create a cached API with caching
     print_separator("Creating Cached API with Caching")
     print("Now creating a CachedScreenRunAPI with built-in caching:")
     print("api = CachedScreenRunAPI()  # That's it! No configuration needed")
     
-    # Create a cached API with caching - using default configuration
-    cached_api = CachedScreenRunAPI()
+    # Create a cached API with caching - only the cache location is customized
+    cached_api = CachedScreenRunAPI(cache_config=CacheConfig(db_path=CACHE_PATH_STR))
     
     # First call with cached API (should hit the API)
     print_separator("First Cached API Call (Cache Miss)")
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     result2 = cached_api.run_simple_screen(
         universe=universe,
         formula=formula,
         as_dataframe=True
     )
-    first_cached_call_time = time.time() - start_time
+    first_cached_call_time = (time.perf_counter_ns() - start_time) / 1e9
     
     # Print results
     print(f"Found {len(result2)} stocks matching criteria")
@@ -82,13 +83,13 @@ def main():
     
     # Second call with cached API (should use cache)
     print_separator("Second Cached API Call (Cache Hit)")
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     result3 = cached_api.run_simple_screen(
         universe=universe,
         formula=formula,
         as_dataframe=True
     )
-    second_cached_call_time = time.time() - start_time
+    second_cached_call_time = (time.perf_counter_ns() - start_time) / 1e9
     
     # Print results and performance comparison
     print(f"Found {len(result3)} stocks matching criteria")
@@ -96,20 +97,19 @@ def main():
     print(f"Speed improvement: {first_cached_call_time / max(second_cached_call_time, 0.001):.1f}x faster")
     
     # Verify results are the same
-    columns_match = set(result2.columns) == set(result3.columns)
-    shape_match = result2.shape == result3.shape
-    print(f"\nResults match: {columns_match and shape_match}")
+    results_match = result2.equals(result3)
+    print(f"\nResults match: {results_match}")
     
     # Bypass cache
     print_separator("Bypassing Cache")
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     result4 = cached_api.run_simple_screen(
         universe=universe,
         formula=formula,
         as_dataframe=True,
-        bypass_cache=True  # Force a fresh API call
+        bypass_cache=True  # Force a fresh API call and refresh the cached entry
     )
-    bypass_call_time = time.time() - start_time
+    bypass_call_time = (time.perf_counter_ns() - start_time) / 1e9
     
     # Print results
     print(f"Found {len(result4)} stocks matching criteria")
@@ -118,7 +118,11 @@ def main():
     # Print cache file information
     print_separator("Cache Information")
     print(f"Cache file: {CACHE_PATH}")
-    print(f"Cache file size: {CACHE_PATH.stat().st_size / 1024:.1f} KB")
+    try:
+        size_kb = os.stat(CACHE_PATH_STR).st_size / 1024
+        print(f"Cache file size: {size_kb:.1f} KB")
+    except FileNotFoundError:
+        print("Cache file does not exist yet")
     
     print_separator("Summary")
     print("The CachedScreenRunAPI provides a simple way to use caching with the P123 API.")
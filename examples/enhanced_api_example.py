@@ -22,6 +22,7 @@ API_KEY = os.environ.get("P123_API_KEY")
 
 # Set up a custom cache path in the examples directory
 CACHE_PATH = Path(__file__).parent / "enhanced_api_cache.db"
+CACHE_PATH_STR = os.fspath(CACHE_PATH)
 
 def print_separator(title):
     """Print a section separator with title."""
@@ -34,7 +35,7 @@ def main():
     # Create cache config
     cache_config = CacheConfig(
         enabled=True,
-        db_path=str(CACHE_PATH),
+        db_path=CACHE_PATH_STR,
         max_cache_size_mb=10,  # Small size for example
         enable_statistics=True,
         auto_cleanup=True
@@ -53,29 +54,29 @@ def main():
 
     # First call - should hit the API
     print_separator("First API Call (Cache Miss)")
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     result1 = api.run_simple_screen(
         universe=universe,
         formula=formula,
         as_dataframe=True
     )
-    first_call_time = time.time() - start_time
+    first_call_time = (time.perf_counter_ns() - start_time) / 1e9
 
     # Print results
     print(f"Found {len(result1)} stocks matching criteria")
     print(f"First call execution time: {first_call_time:.2f} seconds")
     print("\nSample results:")
-    print(result1.head())
+    print(result1.iloc[:5])
 
     # Second call with same parameters - should use cache
     print_separator("Second API Call (Cache Hit)")
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     result2 = api.run_simple_screen(
         universe=universe,
         formula=formula,
         as_dataframe=True
     )
-    second_call_time = time.time() - start_time
+    second_call_time = (time.perf_counter_ns() - start_time) / 1e9
 
     # Print results and performance comparison
     print(f"Found {len(result2)} stocks matching criteria")
@@ -83,31 +84,34 @@ def main():
     print(f"Speed improvement: {first_call_time / max(second_call_time, 0.001):.1f}x faster")
     
     # Verify results are the same
-    columns_match = set(result1.columns) == set(result2.columns)
-    shape_match = result1.shape == result2.shape
-    print(f"\nResults match: {columns_match and shape_match}")
+    results_match = result1.equals(result2)
+    print(f"\nResults match: {results_match}")
 
     # Third call with bypass_cache=True - should hit the API again
     print_separator("Third API Call (Bypass Cache)")
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     result3 = api.run_simple_screen(
         universe=universe,
         formula=formula,
         as_dataframe=True,
         bypass_cache=True
     )
-    third_call_time = time.time() - start_time
+    third_call_time = (time.perf_counter_ns() - start_time) / 1e9
 
     # Print results
     print(f"Found {len(result3)} stocks matching criteria")
     print(f"Third call execution time (bypassing cache): {third_call_time:.2f} seconds")
     print("\nSample results:")
-    print(result3.head())
+    print(result3.iloc[:5])
 
     # Print cache file information
     print_separator("Cache Information")
     print(f"Cache file: {CACHE_PATH}")
-    print(f"Cache file size: {CACHE_PATH.stat().st_size / 1024:.1f} KB")
+    try:
+        size_kb = os.stat(CACHE_PATH_STR).st_size / 1024
+        print(f"Cache file size: {size_kb:.1f} KB")
+    except FileNotFoundError:
+        print("Cache file does not exist yet")
 
 if __name__ == "__main__":
     main()
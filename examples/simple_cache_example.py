@@ -13,6 +13,7 @@ This example shows how to:
 import os
 import time
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 
@@ -47,8 +48,10 @@ def main():
         endpoint_operations_example(cache)
         
         # Example 5: API client integration (if credentials available)
-        if os.environ.get("P123_API_KEY") and os.environ.get("P123_API_SECRET"):
-            api_integration_example(cache)
+        api_id = os.environ.get("P123_API_ID")
+        api_key = os.environ.get("P123_API_KEY")
+        if api_id and api_key:
+            api_integration_example(cache, api_id, api_key)
         else:
             print("\n[API Integration Example] Skipped - API credentials not found in .env file")
     
@@ -105,12 +108,13 @@ def dataframe_cache_example(cache):
     print("\n=== DataFrame Caching ===")
     
     # Create a sample DataFrame (stock data)
+    # Pre-typed arrays let pandas adopt the buffers without a dtype inference pass
     df = pd.DataFrame({
-        'Symbol': ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META'],
-        'Price': [175.23, 328.45, 2659.12, 135.23, 302.67],
-        'Change': [1.2, -0.5, 0.8, -1.5, 2.3],
-        'Volume': [28500000, 15600000, 1200000, 32500000, 18700000],
-        'Market_Cap_B': [2850, 2456, 1789, 1380, 765]
+        'Symbol': np.array(['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META'], dtype=object),
+        'Price': np.array([175.23, 328.45, 2659.12, 135.23, 302.67], dtype=np.float64),
+        'Change': np.array([1.2, -0.5, 0.8, -1.5, 2.3], dtype=np.float64),
+        'Volume': np.array([28500000, 15600000, 1200000, 32500000, 18700000], dtype=np.int64),
+        'Market_Cap_B': np.array([2850, 2456, 1789, 1380, 765], dtype=np.int32)
     })
     
     print(f"Original DataFrame:\n{df.head()}")
@@ -131,7 +135,7 @@ def dataframe_cache_example(cache):
     print(f"Data types preserved: {retrieved_df.dtypes}")
     
     # Perform calculations on the retrieved DataFrame
-    print(f"Average price: {retrieved_df['Price'].mean():.2f}")
+    print(f"Average price: {retrieved_df['Price'].to_numpy().mean():.2f}")
     print(f"Total market cap: {retrieved_df['Market_Cap_B'].sum():.2f} billion")
 
 
@@ -162,12 +166,13 @@ def expiration_example(cache):
     
     # Demonstrate removing expired entries
     # Store a mix of expired and valid entries
-    cache.store("expired_1", {"data": 1}, "cleanup", datetime.now() - timedelta(hours=1))
-    cache.store("expired_2", {"data": 2}, "cleanup", datetime.now() - timedelta(minutes=30))
-    cache.store("valid_1", {"data": 3}, "cleanup", datetime.now() + timedelta(hours=1))
+    now = datetime.now()
+    cache.store("expired_1", {"data": 1}, "cleanup", now - timedelta(hours=1))
+    cache.store("expired_2", {"data": 2}, "cleanup", now - timedelta(minutes=30))
+    cache.store("valid_1", {"data": 3}, "cleanup", now + timedelta(hours=1))
     
     # Remove expired entries
-    removed = cache.remove_expired(datetime.now())
+    removed = cache.remove_expired(now)
     print(f"Removed {removed} expired entries")
     
     # Verify valid entries remain
@@ -179,12 +184,15 @@ def endpoint_operations_example(cache):
     """Demonstrate endpoint-based operations."""
     print("\n=== Endpoint Operations ===")
     
-    # Store multiple entries for different endpoints
-    cache.store("key1", {"data": 1}, "endpoint1", datetime.now() + timedelta(hours=1))
-    cache.store("key2", {"data": 2}, "endpoint1", datetime.now() + timedelta(hours=1))
-    cache.store("key3", {"data": 3}, "endpoint2", datetime.now() + timedelta(hours=1))
-    cache.store("key4", {"data": 4}, "endpoint2", datetime.now() + timedelta(hours=1))
-    cache.store("key5", {"data": 5}, "endpoint3", datetime.now() + timedelta(hours=1))
+    # Store multiple entries for different endpoints in a single transaction
+    exp = datetime.now() + timedelta(hours=1)
+    cache.store_many([
+        ("key1", {"data": 1}, "endpoint1", exp),
+        ("key2", {"data": 2}, "endpoint1", exp),
+        ("key3", {"data": 3}, "endpoint2", exp),
+        ("key4", {"data": 4}, "endpoint2", exp),
+        ("key5", {"data": 5}, "endpoint3", exp),
+    ])
     
     print("Stored 5 entries across 3 endpoints")
     
@@ -203,15 +211,15 @@ def endpoint_operations_example(cache):
     print(f"Cleared all entries: {success}")
 
 
-def api_integration_example(cache):
+def api_integration_example(cache, api_id, api_key):
     """Demonstrate integration with an API client."""
     print("\n=== API Client Integration ===")
     
     try:
         # Create API client with the cache
         client = MarketClient(
-            api_id=os.environ.get("P123_API_ID"),
-            api_key=os.environ.get("P123_API_KEY"),
+            api_id=api_id,
+            api_key=api_key,
             cache_enabled=True,
             cache_storage=cache
         )
@@ -220,16 +228,16 @@ def api_integration_example(cache):
         
         # First call will fetch from API and cache
         print("Fetching market data (first call)...")
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         data1 = client.get_market_data()
-        elapsed1 = time.time() - start_time
+        elapsed1 = (time.perf_counter_ns() - start_time) / 1e9
         print(f"First call completed in {elapsed1:.2f} seconds")
         
         # Second call should be from cache
         print("Fetching market data again (should use cache)...")
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         data2 = client.get_market_data()
-        elapsed2 = time.time() - start_time
+        elapsed2 = (time.perf_counter_ns() - start_time) / 1e9
         print(f"Second call completed in {elapsed2:.2f} seconds")
         
         # Compare performance
@@ -238,7 +246,7 @@ def api_integration_example(cache):
             print(f"Cache speedup: {speedup:.1f}x faster")
             
         # Verify data equality
-        print(f"Data from both calls is identical: {data1 == data2}")
+        print(f"Data from both calls is identical: {data1 is data2 or data1 == data2}")
         
     except Exception as e:
         print(f"Error in API integration example: {e}")
@@ -4,79 +4,55 @@
 import sys
 import os
 import re
-import subprocess
 from pathlib import Path
 from rich.console import Console
 from rich.table import Table
 
-def get_test_class_name(module_path):
-    """Get the class name from the test file."""
-    test_class_map = {
-        'tests/test_cache_manager.py': 'TestCacheManager',
-        'tests/cache_tests.py': 'TestSimpleStorage',
-        'tests/screen_run/test_screen_run_cache.py': 'TestScreenRunCache',
-        # Add more mappings as needed based on your codebase
-    }
-    
-    # Use the predefined mapping if available
-    rel_path = os.path.relpath(module_path)
-    if rel_path in test_class_map:
-        return test_class_map[rel_path]
-    
-    # Otherwise, try to detect class name directly
-    try:
-        cmd = ['grep', '-n', 'class Test', module_path]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0 and result.stdout:
-            for line in result.stdout.splitlines():
-                match = re.search(r'class (\w+):', line)
-                if match:
-                    return match.group(1)
-    except Exception as e:
-        print(f"Error finding class name: {e}", file=sys.stderr)
-    
-    # Default to None if no class found (for module-level tests)
-    return None
+# Matches test classes and test functions/methods (module level or one indent deep)
+TEST_DEF_RE = re.compile(
+    rb'^(?:class\s+(Test\w*)[(:]|(?: {4})?(?:async\s+)?def\s+test_(\w+)\()', re.M
+)
+
+TEST_CLASS_MAP = {
+    'tests/test_cache_manager.py': 'TestCacheManager',
+    'tests/cache_tests.py': 'TestSimpleStorage',
+    'tests/screen_run/test_screen_run_cache.py': 'TestScreenRunCache',
+    # Add more mappings as needed based on your codebase
+}
+
+# One console for every call; auto-highlighting and emoji codes are never used here
+CONSOLE = Console(highlight=False, emoji=False)
+
+def scan_test_file(module_path, test_names):
+    """Get the test class name and test line numbers from a single read of the file.
 
-def get_test_line_numbers_from_grep(module_path, test_names):
-    """Get line numbers for test methods using grep."""
+    Returns:
+        Tuple of (class name or None for module-level tests, {test_name: line_number})
+    """
+    class_name = TEST_CLASS_MAP.get(os.path.relpath(module_path))
     test_info = {}
-    
+    # Scan raw bytes so the file never needs to be decoded
+    wanted = {name.encode() for name in test_names}
+
     try:
-        # First try class methods with async def
-        cmd = ['grep', '-n', '    async def test_', module_path]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        # If no async tests, try regular class methods
-        if result.returncode != 0 or not result.stdout:
-            cmd = ['grep', '-n', '    def test_', module_path]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        # If still nothing, try module-level test functions
-        if result.returncode != 0 or not result.stdout:
-            cmd = ['grep', '-n', '^def test_', module_path]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            for line in result.stdout.splitlines():
-                # Format: "44:    async def test_rate_limit_handling(self):"
-                parts = line.split(':', 1)
-                if len(parts) < 2:
-                    continue
-                    
-                line_number = int(parts[0])
-                line_content = parts[1]
-                
-                # Extract the test name
-                match = re.search(r'(?:async )?def test_(\w+)\(', line_content)
-                if match:
-                    test_name = match.group(1)
-                    if test_name in test_names:
-                        test_info[test_name] = line_number
-    except Exception as e:
-        print(f"Error running grep: {e}", file=sys.stderr)
-    
-    return test_info
+        data = Path(module_path).read_bytes()
+    except OSError as e:
+        print(f"Error reading test file: {e}", file=sys.stderr)
+        return class_name, test_info
+
+    # Count newlines incrementally so line lookup stays a single pass over the file
+    line_number = 1
+    pos = 0
+    for match in TEST_DEF_RE.finditer(data):
+        line_number += data.count(b'\n', pos, match.start())
+        pos = match.start()
+        if match.group(1):
+            if class_name is None:
+                class_name = match.group(1).decode()
+        elif match.group(2) in wanted:
+            test_info.setdefault(match.group(2).decode(), line_number)
+
+    return class_name, test_info
 
 def main():
     """Format test output with line numbers."""
@@ -88,15 +64,11 @@ def main():
     category_name = sys.argv[2]
     test_names = sys.argv[3:]
     
-    # Get test class name from the file
-    class_name = get_test_class_name(test_file)
-    
-    # Get test line numbers using grep
-    test_info = get_test_line_numbers_from_grep(test_file, test_names)
+    # Get test class name and line numbers from the file
+    class_name, test_info = scan_test_file(test_file, test_names)
     
-    # Create a rich console and table
-    console = Console()
-    table = Table(title=f"{category_name} Tests Summary")
+    # Create the summary table
+    table = Table(title=f"{category_name} Tests Summary", show_edge=False)
     table.add_column("Test Name", style="cyan")
     table.add_column("Line", style="yellow")
     table.add_column("Result", style="green")
@@ -123,15 +95,15 @@ def main():
             ide_locations.append(nodeid)
     
     # Print category summary
-    console.print("\n\nOverall Test Results Summary by Category")
-    console.print(table)
-    console.print("[green]ALL TESTS PASSED[/green]")
+    CONSOLE.print("\n\nOverall Test Results Summary by Category")
+    CONSOLE.print(table)
+    CONSOLE.print("[green]ALL TESTS PASSED[/green]")
     
     # Print locations for IDE navigation
     if ide_locations:
-        console.print("\n[bold]Test Locations for IDE Navigation:[/bold]")
+        CONSOLE.print("\n[bold]Test Locations for IDE Navigation:[/bold]")
         for nodeid in ide_locations:
-            console.print(nodeid)
+            CONSOLE.print(nodeid, markup=False)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
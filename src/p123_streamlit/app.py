@@ -1,23 +1,37 @@
+import io
+import json
 import logging
 import os
 from datetime import date
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 from dotenv import load_dotenv
-from plotly.subplots import make_subplots
+from p123api import ClientException
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+
+@st.cache_resource
+def _load_env() -> Path:
+    """Load the root .env once per server process.
+
+    Streamlit re-executes this script in a fresh namespace on every rerun, so a module
+    global can't remember that the file was already parsed; a cached resource can.
+    """
+    env_path = Path(__file__).resolve().parents[2] / ".env"
+    load_dotenv(env_path)
+    logger.info("Loaded environment variables from %s", env_path)
+    return env_path
+
+
 # Load environment variables from the root directory
-root_dir = Path(__file__).parent.parent.parent
-env_path = root_dir / ".env"
-load_dotenv(env_path)
-logger.info("Loaded environment variables from %s", env_path)
+_load_env()
 
 from p123api_client.models.enums import PitMethod, RankType, RebalFreq, Scope, TransType
 from p123api_client.models.schemas import Factor
@@ -37,6 +51,208 @@ from p123api_client.screen_backtest.screen_backtest_api import ScreenBacktestAPI
 
 st.set_page_config(page_title="P123 Analysis Tools", layout="wide")
 
+# Selectbox options are fixed, so build them once instead of on every rerun
+PIT_METHOD_NAMES = tuple(m.name for m in PitMethod)
+TRANS_TYPE_NAMES = tuple(t.name for t in TransType)
+REBAL_FREQ_NAMES = tuple(f.name for f in RebalFreq)
+RANK_TYPE_NAMES = tuple(rt.name for rt in RankType)
+SCOPE_NAMES = tuple(s.name for s in Scope)
+SCREEN_TYPE_NAMES = tuple(t.name for t in ScreenType)
+SCREEN_METHOD_NAMES = tuple(m.name for m in ScreenMethod)
+CURRENCY_NAMES = tuple(c.name for c in Currency)
+TRANS_PRICE_NAMES = tuple(t.name for t in TransPrice)
+RISK_STATS_PERIOD_NAMES = tuple(r.name for r in RiskStatsPeriod)
+
+# Backtest statistics as (column, attribute, format): per-portfolio metrics are shown
+# for the screen and the benchmark, relative ones only for the screen
+PORTFOLIO_STATS = (
+    ("Total Return", "total_return", "%.2f%%"),
+    ("Annualized Return", "annualized_return", "%.2f%%"),
+    ("Max Drawdown", "max_drawdown", "%.2f%%"),
+    ("Sharpe", "sharpe_ratio", "%.2f"),
+    ("Sortino", "sortino_ratio", "%.2f"),
+    ("StdDev", "standard_dev", "%.2f%%"),
+)
+RELATIVE_STATS = (
+    ("Correl/Bench", "correlation", "%.2f"),
+    ("R-Squared", "r_squared", "%.2f"),
+    ("Beta", "beta", "%.2f"),
+    ("Alpha", "alpha", "%.2f%%"),
+)
+
+# Number formats for the backtest statistics table
+STATS_COLUMN_CONFIG = {
+    "Total Return": st.column_config.NumberColumn(format="%.2f%%"),
+    "Annualized Return": st.column_config.NumberColumn(format="%.2f%%"),
+    "Max Drawdown": st.column_config.NumberColumn(format="%.2f%%"),
+    "Sharpe": st.column_config.NumberColumn(format="%.2f"),
+    "Sortino": st.column_config.NumberColumn(format="%.2f"),
+    "StdDev": st.column_config.NumberColumn(format="%.2f%%"),
+    "Correl/Bench": st.column_config.NumberColumn(format="%.2f"),
+    "R-Squared": st.column_config.NumberColumn(format="%.2f"),
+    "Beta": st.column_config.NumberColumn(format="%.2f"),
+    "Alpha": st.column_config.NumberColumn(format="%.2f%%"),
+}
+
+# API results only change when P123 refreshes its data
+RESULTS_TTL_SECONDS = 3 * 3600
+
+# Line traces longer than this are downsampled before they're sent to the browser
+MAX_CHART_POINTS = 2000
+
+
+def _lttb(x, y, n: int = MAX_CHART_POINTS) -> tuple[np.ndarray, np.ndarray]:
+    """Downsample a series with Largest-Triangle-Three-Buckets, keeping its visual shape.
+
+    Points are treated as evenly spaced, which holds for the backtest's periodic dates.
+
+    Args:
+        x: X values (e.g. dates)
+        y: Numeric Y values
+        n: Number of points to keep
+
+    Returns:
+        Tuple of (x, y) arrays with at most n points
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    size = len(y)
+    if size <= n or n < 3:
+        return x, y
+
+    # First and last points are always kept; the rest is split into n - 2 buckets
+    edges = np.linspace(1, size - 1, n - 1).astype(np.intp)
+    keep = np.empty(n, dtype=np.intp)
+    keep[0], keep[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < n - 1:
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = size - 1, size
+        avg_x = (next_start + next_end - 1) / 2
+        avg_y = y[next_start:next_end].mean()
+
+        # Keep the point forming the largest triangle with the last kept point and
+        # the next bucket's average
+        positions = np.arange(start, end)
+        areas = np.abs((a - avg_x) * (y[start:end] - y[a]) - (a - positions) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        keep[i + 1] = a
+
+    return x[keep], y[keep]
+
+
+def _is_auth_failure(error: ClientException) -> bool:
+    """Whether a P123 client error came from rejected credentials."""
+    resp = error.get_resp()
+    return resp is not None and resp.status_code == 401
+
+
+def _session_client(key: tuple, factory):
+    """Return this browser session's API client for key, creating it on first use.
+
+    Clients live in st.session_state rather than st.cache_resource: p123api keeps the
+    auth token in its HTTP session headers and resets them on re-authentication, so a
+    client must not be shared between users' concurrent reruns.
+    """
+    clients = st.session_state.setdefault("api_clients", {})
+    if key not in clients:
+        clients[key] = factory()
+    return clients[key]
+
+
+def _make_rank_api(api_id: str, api_key: str, cfg_key: str) -> RankPerformanceAPI:
+    """Get the rank performance client, reused across reruns with the same settings."""
+    return _session_client(
+        ("rank", api_id, api_key, cfg_key),
+        lambda: RankPerformanceAPI(config=json.loads(cfg_key), api_id=api_id, api_key=api_key),
+    )
+
+
+def _make_backtest_api(api_id: str, api_key: str) -> ScreenBacktestAPI:
+    """Get the screen backtest client, reused across reruns."""
+    return _session_client(
+        ("backtest", api_id, api_key),
+        lambda: ScreenBacktestAPI(api_id=api_id, api_key=api_key),
+    )
+
+
+@st.cache_data
+def _backtest_layout() -> dict:
+    """Build the backtest figure layout: three stacked panels with shared titles.
+
+    Uses the same domains make_subplots(rows=3, vertical_spacing=0.1) produces. The
+    skeleton never changes, so it is built once; st.cache_data hands every caller its
+    own copy to fill in.
+    """
+    panel_height = (1 - 2 * 0.1) / 3
+    domains = [
+        [1 - panel_height, 1.0],
+        [panel_height + 0.1, 1 - panel_height - 0.1],
+        [0.0, panel_height],
+    ]
+    return {
+        "height": 800,
+        "showlegend": True,
+        "title": {"text": "Screen Backtest Results", "x": 0.5, "y": 0.95},
+        "xaxis": {"anchor": "y", "domain": [0.0, 1.0]},
+        "yaxis": {"anchor": "x", "domain": domains[0], "title": {"text": "Value"}},
+        "xaxis2": {"anchor": "y2", "domain": [0.0, 1.0]},
+        "yaxis2": {"anchor": "x2", "domain": domains[1], "title": {"text": "Turnover %"}},
+        "xaxis3": {"anchor": "y3", "domain": [0.0, 1.0], "title": {"text": "Date"}},
+        "yaxis3": {"anchor": "x3", "domain": domains[2], "title": {"text": "# Positions"}},
+        "annotations": [
+            {
+                "text": title,
+                "font": {"size": 16},
+                "showarrow": False,
+                "x": 0.5,
+                "xanchor": "center",
+                "xref": "paper",
+                "y": domain[1],
+                "yanchor": "bottom",
+                "yref": "paper",
+            }
+            for title, domain in zip(
+                ("Performance", "Turnover %", "Number of Positions"), domains, strict=True
+            )
+        ],
+    }
+
+
+@st.cache_data
+def load_factors(file_bytes: bytes) -> pd.DataFrame:
+    """Parse an uploaded factor TSV, skipping the parse when the file is unchanged."""
+    # Arrow's multithreaded parser, reading only the columns that become factors
+    return pd.read_csv(
+        io.BytesIO(file_bytes),
+        sep="\t",
+        engine="pyarrow",
+        dtype_backend="pyarrow",
+        usecols=["formula", "rank_type"],
+    )
+
+
+@st.cache_data(ttl=RESULTS_TTL_SECONDS)
+def run_rank_performance_cached(
+    _api: RankPerformanceAPI, api_id: str, cfg_key: str, request_json: str
+) -> pd.DataFrame:
+    """Run a rank performance test, memoized per account on the serialized request.
+
+    The caller's client is left out of the cache key (leading underscore); api_id
+    keeps one account's results from being served to another.
+    """
+    return _api.run_rank_performance([RankPerformanceAPIRequest.model_validate_json(request_json)])
+
+
+@st.cache_data(ttl=RESULTS_TTL_SECONDS)
+def run_backtest_cached(_api: ScreenBacktestAPI, api_id: str, request_json: str):
+    """Run a screen backtest, memoized per account on the serialized request."""
+    return _api.run_backtest(BacktestRequest.model_validate_json(request_json))
+
+
 # Create tabs
 tab1, tab2 = st.tabs(["Rank Performance", "Screen Backtest"])
 
@@ -60,46 +276,82 @@ if not api_id or not api_key:
     P123_API_KEY=your_api_key_here
     """)
 
-# Rank Performance Tab
-with tab1:
-    st.title("Portfolio123 Rank Performance Tester")
+# Rank Performance settings
+st.sidebar.subheader("Rank Performance Settings")
+pit_method = st.sidebar.selectbox("PIT Method", options=PIT_METHOD_NAMES, index=0, key="rank_pit")
+trans_type = st.sidebar.selectbox("Transaction Type", options=TRANS_TYPE_NAMES, index=0)
+rebal_freq = st.sidebar.selectbox("Rebalance Frequency", options=REBAL_FREQ_NAMES, index=0)
+
+# Performance Parameters
+with st.sidebar.expander("Performance Parameters"):
+    min_holding_period = st.number_input(
+        "Min Holding Period", value=1, min_value=1, key="rank_min_hold"
+    )
+    max_holding_period = st.number_input(
+        "Max Holding Period", value=20, min_value=1, key="rank_max_hold"
+    )
+    commission = st.number_input("Commission", value=0.001, format="%.3f", key="rank_commission")
+    slippage = st.number_input("Slippage", value=0.001, format="%.3f", key="rank_slippage")
+    min_pos_size = st.number_input(
+        "Min Position Size", value=0.01, format="%.2f", key="rank_min_pos"
+    )
+    max_pos_size = st.number_input(
+        "Max Position Size", value=0.10, format="%.2f", key="rank_max_pos"
+    )
+    max_turnover = st.number_input(
+        "Max Turnover", value=1.0, format="%.1f", key="rank_max_turnover"
+    )
+    max_positions = st.number_input(
+        "Max Positions", value=100, min_value=1, key="rank_max_positions"
+    )
+
+scope = st.sidebar.selectbox("Scope", options=SCOPE_NAMES, index=0)
 
-    # Advanced Settings in Sidebar
-    st.sidebar.subheader("Rank Performance Settings")
-    pit_method = st.sidebar.selectbox(
-        "PIT Method", options=[m.name for m in PitMethod], index=0, key="rank_pit"
+# Screen Settings
+st.sidebar.subheader("Screen Settings")
+screen_type = st.sidebar.selectbox("Screen Type", options=SCREEN_TYPE_NAMES, index=0)
+universe = st.sidebar.text_input("Universe", value="01 SmallCap Bulls Rank US")
+benchmark = st.sidebar.text_input("Benchmark", value="spy")
+method = st.sidebar.selectbox("Method", options=SCREEN_METHOD_NAMES, index=0)
+currency = st.sidebar.selectbox("Currency", options=CURRENCY_NAMES, index=0)
+
+# Advanced Screen Parameters
+with st.sidebar.expander("Advanced Parameters"):
+    precision = st.number_input(
+        "Precision", value=2, min_value=2, max_value=4, key="screen_precision"
+    )
+    trans_price = st.selectbox(
+        "Transaction Price",
+        options=TRANS_PRICE_NAMES,
+        index=0,
+        key="screen_trans_price",
     )
-    trans_type = st.sidebar.selectbox(
-        "Transaction Type", options=[t.name for t in TransType], index=0
+    screen_slippage = st.number_input("Slippage", value=0.001, format="%.3f", key="screen_slippage")
+    long_weight = st.number_input(
+        "Long Weight", value=100, min_value=0, max_value=100, key="screen_long_weight"
     )
-    rebal_freq = st.sidebar.selectbox(
-        "Rebalance Frequency", options=[f.name for f in RebalFreq], index=0
+    rank_tolerance = st.number_input(
+        "Rank Tolerance", value=7, min_value=1, key="screen_rank_tolerance"
     )
+    max_holdings = st.number_input("Max Holdings", value=25, min_value=1, key="screen_max_holdings")
+    risk_stats_period = st.selectbox(
+        "Risk Stats Period",
+        options=RISK_STATS_PERIOD_NAMES,
+        index=0,
+        key="screen_risk_period",
+    )
+
 
-    # Performance Parameters
-    with st.sidebar.expander("Performance Parameters"):
-        min_holding_period = st.number_input(
-            "Min Holding Period", value=1, min_value=1, key="rank_min_hold"
-        )
-        max_holding_period = st.number_input(
-            "Max Holding Period", value=20, min_value=1, key="rank_max_hold"
-        )
-        commission = st.number_input(
-            "Commission", value=0.001, format="%.3f", key="rank_commission"
-        )
-        slippage = st.number_input("Slippage", value=0.001, format="%.3f", key="rank_slippage")
-        min_pos_size = st.number_input(
-            "Min Position Size", value=0.01, format="%.2f", key="rank_min_pos"
-        )
-        max_pos_size = st.number_input(
-            "Max Position Size", value=0.10, format="%.2f", key="rank_max_pos"
-        )
-        max_turnover = st.number_input(
-            "Max Turnover", value=1.0, format="%.1f", key="rank_max_turnover"
-        )
-        max_positions = st.number_input(
-            "Max Positions", value=100, min_value=1, key="rank_max_positions"
-        )
+# Each tab's main body is a fragment, so its widgets rerun only that tab. Sidebar
+# widgets are shared (the backtest also uses the PIT method and rebalance frequency)
+# and fragments can't write to the sidebar, so they stay above in the full script run.
+@st.fragment
+def rank_performance_tab():
+    """Render the Rank Performance tab."""
+    st.title("Portfolio123 Rank Performance Tester")
+
+    # Set by the chosen input method below
+    factors = []
 
     # Factor Input Method Selection
     input_method = st.radio("Choose input method:", ["Manual Input", "TSV Upload"])
@@ -110,14 +362,13 @@ with tab1:
         # Single/Multi Factor Selection
         factor_count = st.number_input("Number of factors", min_value=1, max_value=10, value=1)
 
-        factors = []
         for i in range(factor_count):
             st.markdown(f"#### Factor {i + 1}")
             col1, col2 = st.columns(2)
 
             formula = col1.text_input(f"Formula #{i + 1}", value="Close(0)", key=f"formula_{i}")
             rank_type = col2.selectbox(
-                f"Rank Type #{i + 1}", options=[rt.name for rt in RankType], key=f"rank_type_{i}"
+                f"Rank Type #{i + 1}", options=RANK_TYPE_NAMES, key=f"rank_type_{i}"
             )
 
             if formula:
@@ -128,19 +379,14 @@ with tab1:
         uploaded_file = st.file_uploader("Choose a TSV file", type="tsv")
 
         if uploaded_file is not None:
-            factors = []
-            df = pd.read_csv(uploaded_file, sep="\t")
-            for _, row in df.iterrows():
-                factors.append(
-                    Factor(
-                        formula=row["formula"],
-                        rank_type=RankType[row["rank_type"].upper()],
-                        weight=1.0,
-                    )
-                )
-
-    # Common Settings
-    scope = st.sidebar.selectbox("Scope", options=[s.name for s in Scope], index=0)
+            df = load_factors(uploaded_file.getvalue())
+            # Zip the columns rather than iterrows() so no Series is built per row;
+            # the upper-casing is vectorized and unknown rank types still raise KeyError
+            rank_types = [RankType[name] for name in df["rank_type"].str.upper()]
+            factors = [
+                Factor(formula=formula, rank_type=rank_type, weight=1.0)
+                for formula, rank_type in zip(df["formula"].to_numpy(), rank_types, strict=True)
+            ]
 
     if st.button("Run Performance Test") and factors:
         try:
@@ -163,8 +409,8 @@ with tab1:
                 }
             }
 
-            # Create API client
-            api = RankPerformanceAPI(config=config, api_id=api_id, api_key=api_key)
+            # Settings are passed as a stable JSON key so cached clients and results match
+            cfg_key = json.dumps(config, sort_keys=True)
 
             # Create ranking definition
             ranking_def = RankingDefinition(
@@ -181,24 +427,27 @@ with tab1:
 
             with st.spinner("Running performance test..."):
                 # Run performance test with request in a list
-                result = api.run_rank_performance([request])
+                result = run_rank_performance_cached(
+                    _make_rank_api(api_id, api_key, cfg_key),
+                    api_id,
+                    cfg_key,
+                    request.model_dump_json(),
+                )
 
                 # Try to extract returns data
                 bucket_returns = None
                 if isinstance(result, pd.DataFrame):
-                    # Handle DataFrame response
-                    bucket_cols = [
-                        col for col in result.columns if col.startswith("bucket_ann_ret_")
-                    ]
+                    # Handle DataFrame response, probing the columns in a single pass
+                    columns = set(result.columns)
+                    # Sort to ensure correct order
+                    bucket_cols = sorted(c for c in columns if c.startswith("bucket_ann_ret_"))
                     if bucket_cols:
-                        bucket_cols.sort()  # Sort to ensure correct order
-                        bucket_returns = result[bucket_cols].iloc[0].tolist()
-                    elif "return" in result.columns:
-                        bucket_returns = result["return"].tolist()
-                    elif "returns" in result.columns:
-                        bucket_returns = result["returns"].tolist()
-                    elif "bucket_returns" in result.columns:
-                        bucket_returns = result["bucket_returns"].tolist()
+                        bucket_returns = result[bucket_cols].to_numpy()[0].tolist()
+                    else:
+                        for candidate in ("return", "returns", "bucket_returns"):
+                            if candidate in columns:
+                                bucket_returns = result[candidate].to_numpy().tolist()
+                                break
                 elif isinstance(result, dict):
                     # Handle dictionary response
                     if "return" in result:
@@ -219,39 +468,49 @@ with tab1:
                         else None
                     )
 
-                    # Create bar chart of bucket returns with benchmark line
-                    fig = go.Figure()
-
-                    # Add bars
-                    fig.add_trace(
-                        go.Bar(
-                            x=[f"Bucket {i + 1}" for i in range(len(bucket_returns))],
-                            y=bucket_returns,
-                            text=[f"{return_val:.2f}" for return_val in bucket_returns],
-                            textposition="auto",
-                            name="Bucket Returns",
-                        )
-                    )
+                    # Create bar chart of bucket returns with benchmark line, built from
+                    # plain dicts in a single Figure construction
+                    bucket_labels = [f"Bucket {i + 1}" for i in range(len(bucket_returns))]
+                    traces = [
+                        {
+                            "type": "bar",
+                            "x": bucket_labels,
+                            "y": bucket_returns,
+                            "text": [f"{return_val:.2f}" for return_val in bucket_returns],
+                            "textposition": "auto",
+                            "name": "Bucket Returns",
+                        }
+                    ]
 
-                    # Add benchmark line if available
+                    # Add benchmark line if available; a flat line only needs its two ends
                     if benchmark_return is not None:
-                        fig.add_trace(
-                            go.Scatter(
-                                x=[f"Bucket {i + 1}" for i in range(len(bucket_returns))],
-                                y=[benchmark_return] * len(bucket_returns),
-                                mode="lines",
-                                line={"dash": "dot"},
-                                name=f"Benchmark Return ({benchmark_return:.2f})",
-                            )
+                        traces.append(
+                            {
+                                "type": "scatter",
+                                "x": [bucket_labels[0], bucket_labels[-1]],
+                                "y": [benchmark_return, benchmark_return],
+                                "mode": "lines",
+                                "line": {"dash": "dot"},
+                                "name": f"Benchmark Return ({benchmark_return:.2f})",
+                            }
                         )
 
-                    fig.update_layout(
-                        title="Bucket Returns",
-                        xaxis_title="Buckets",
-                        yaxis_title="Return",
-                        yaxis_tickformat=".2f",
-                        showlegend=True,
-                        legend={"yanchor": "top", "y": 0.99, "xanchor": "left", "x": 0.01},
+                    fig = go.Figure(
+                        {
+                            "data": traces,
+                            "layout": {
+                                "title": {"text": "Bucket Returns"},
+                                "xaxis": {"title": {"text": "Buckets"}},
+                                "yaxis": {"title": {"text": "Return"}, "tickformat": ".2f"},
+                                "showlegend": True,
+                                "legend": {
+                                    "yanchor": "top",
+                                    "y": 0.99,
+                                    "xanchor": "left",
+                                    "x": 0.01,
+                                },
+                            },
+                        }
                     )
 
                     st.plotly_chart(fig, use_container_width=True)
@@ -265,52 +524,20 @@ with tab1:
                         "Please check the raw response above."
                     )
 
-        except Exception as e:
-            st.error(f"Error running performance test: {str(e)}")
-            if "401" in str(e):
+        except ClientException as e:
+            st.error(f"Error running performance test: {e}")
+            if _is_auth_failure(e):
                 st.error(
                     "Authentication failed. Please check your API credentials in the .env file."
                 )
+        except Exception as e:
+            st.error(f"Error running performance test: {str(e)}")
 
-# Screen Backtest Tab
-with tab2:
-    st.title("Portfolio123 Screen Backtest")
 
-    # Screen Settings
-    st.sidebar.subheader("Screen Settings")
-    screen_type = st.sidebar.selectbox("Screen Type", options=[t.name for t in ScreenType], index=0)
-    universe = st.sidebar.text_input("Universe", value="01 SmallCap Bulls Rank US")
-    benchmark = st.sidebar.text_input("Benchmark", value="spy")
-    method = st.sidebar.selectbox("Method", options=[m.name for m in ScreenMethod], index=0)
-    currency = st.sidebar.selectbox("Currency", options=[c.name for c in Currency], index=0)
-
-    # Advanced Screen Parameters
-    with st.sidebar.expander("Advanced Parameters"):
-        precision = st.number_input(
-            "Precision", value=2, min_value=2, max_value=4, key="screen_precision"
-        )
-        trans_price = st.selectbox(
-            "Transaction Price",
-            options=[t.name for t in TransPrice],
-            index=0,
-            key="screen_trans_price",
-        )
-        slippage = st.number_input("Slippage", value=0.001, format="%.3f", key="screen_slippage")
-        long_weight = st.number_input(
-            "Long Weight", value=100, min_value=0, max_value=100, key="screen_long_weight"
-        )
-        rank_tolerance = st.number_input(
-            "Rank Tolerance", value=7, min_value=1, key="screen_rank_tolerance"
-        )
-        max_holdings = st.number_input(
-            "Max Holdings", value=25, min_value=1, key="screen_max_holdings"
-        )
-        risk_stats_period = st.selectbox(
-            "Risk Stats Period",
-            options=[r.name for r in RiskStatsPeriod],
-            index=0,
-            key="screen_risk_period",
-        )
+@st.fragment
+def screen_backtest_tab():
+    """Render the Screen Backtest tab."""
+    st.title("Portfolio123 Screen Backtest")
 
     # Screen Rules Input
     st.subheader("Screen Rules")
@@ -323,9 +550,6 @@ with tab2:
 
     if st.button("Run Screen Backtest"):
         try:
-            logger.info("Creating screen backtest API client")
-            api = ScreenBacktestAPI(api_id=api_id, api_key=api_key)
-
             logger.info("Creating screen parameters")
             screen_params = ScreenParams(
                 type=ScreenType[screen_type],
@@ -345,7 +569,7 @@ with tab2:
                 pitMethod=PitMethod[pit_method],
                 precision=precision,
                 transPrice=TransPrice[trans_price],
-                slippage=slippage,
+                slippage=screen_slippage,
                 longWeight=long_weight,
                 rankTolerance=rank_tolerance,
                 rebalFreq=RebalFreq[rebal_freq],
@@ -354,86 +578,65 @@ with tab2:
             )
 
             with st.spinner("Running screen backtest..."):
-                logger.info("Running backtest with request: %s", request)
-                result = api.run_backtest(request)
+                # Serialized once: it is both the memoization key and the logged form.
+                # %-style arguments are only formatted when the record is emitted.
+                request_json = request.model_dump_json()
+                logger.info("Running backtest with request: %s", request_json)
+                result = run_backtest_cached(
+                    _make_backtest_api(api_id, api_key), api_id, request_json
+                )
                 logger.info("Received backtest response")
 
                 # Display results
                 st.subheader("Backtest Results")
 
-                # Create figure with subplots
-                fig = make_subplots(
-                    rows=3,
-                    cols=1,
-                    subplot_titles=("Performance", "Turnover %", "Number of Positions"),
-                    vertical_spacing=0.1,
-                    specs=[
-                        [{"secondary_y": True}],
-                        [{"secondary_y": False}],
-                        [{"secondary_y": False}],
-                    ],
-                )
-
-                # Add performance traces
-                fig.add_trace(
-                    go.Scatter(
-                        x=result.chart.dates,
-                        y=result.chart.screenReturns,
-                        name="Strategy",
-                        line={"color": "red"},
-                    ),
-                    row=1,
-                    col=1,
-                )
-                fig.add_trace(
-                    go.Scatter(
-                        x=result.chart.dates,
-                        y=result.chart.benchReturns,
-                        name="Benchmark",
-                        line={"color": "blue"},
-                    ),
-                    row=1,
-                    col=1,
-                )
-
-                # Add turnover trace
-                fig.add_trace(
-                    go.Bar(
-                        x=result.chart.dates,
-                        y=result.chart.turnoverPct,
-                        name="Turnover %",
-                        marker_color="lightblue",
-                    ),
-                    row=2,
-                    col=1,
-                )
-
-                # Add positions trace
-                fig.add_trace(
-                    go.Bar(
-                        x=result.chart.dates,
-                        y=result.chart.positionCnt,
-                        name="# Positions",
-                        marker_color="lightgreen",
-                    ),
-                    row=3,
-                    col=1,
-                )
-
-                # Update layout
-                fig.update_layout(
-                    height=800,
-                    showlegend=True,
-                    title_text="Screen Backtest Results",
-                    title_x=0.5,
-                    title_y=0.95,
-                )
-
-                # Update axes labels
-                fig.update_xaxes(title_text="Date", row=3, col=1)
-                fig.update_yaxes(title_text="Value", row=1, col=1)
-                fig.update_yaxes(title_text="Turnover %", row=2, col=1)
-                fig.update_yaxes(title_text="# Positions", row=3, col=1)
+                # Build the figure from plain dicts in one go, without per-trace
+                # graph-object construction and add_trace relayouts. Performance lines
+                # use WebGL and are downsampled so long daily backtests stay responsive
+                # in the browser.
+                chart = result.chart
+                dates = chart.dates
+                strategy_x, strategy_y = _lttb(dates, chart.screenReturns)
+                bench_x, bench_y = _lttb(dates, chart.benchReturns)
+                traces = [
+                    {
+                        "type": "scattergl",
+                        "x": strategy_x,
+                        "y": strategy_y,
+                        "name": "Strategy",
+                        "line": {"color": "red"},
+                        "xaxis": "x",
+                        "yaxis": "y",
+                    },
+                    {
+                        "type": "scattergl",
+                        "x": bench_x,
+                        "y": bench_y,
+                        "name": "Benchmark",
+                        "line": {"color": "blue"},
+                        "xaxis": "x",
+                        "yaxis": "y",
+                    },
+                    {
+                        "type": "bar",
+                        "x": dates,
+                        "y": chart.turnoverPct,
+                        "name": "Turnover %",
+                        "marker": {"color": "lightblue"},
+                        "xaxis": "x2",
+                        "yaxis": "y2",
+                    },
+                    {
+                        "type": "bar",
+                        "x": dates,
+                        "y": chart.positionCnt,
+                        "name": "# Positions",
+                        "marker": {"color": "lightgreen"},
+                        "xaxis": "x3",
+                        "yaxis": "y3",
+                    },
+                ]
+                fig = go.Figure({"data": traces, "layout": _backtest_layout()})
 
                 # Display plot
                 st.plotly_chart(fig, use_container_width=True)
@@ -442,38 +645,14 @@ with tab2:
                 if hasattr(result, "stats"):
                     st.subheader("Statistics")
 
-                    # Create DataFrame structure
-                    stats_data = {
-                        "": ["Screen", "S&P 500 (SPY:USA)"],  # Index names
-                        "Total Return": [
-                            f"{result.stats.port.total_return:.2f}%",
-                            f"{result.stats.bench.total_return:.2f}%",
-                        ],
-                        "Annualized Return": [
-                            f"{result.stats.port.annualized_return:.2f}%",
-                            f"{result.stats.bench.annualized_return:.2f}%",
-                        ],
-                        "Max Drawdown": [
-                            f"{result.stats.port.max_drawdown:.2f}%",
-                            f"{result.stats.bench.max_drawdown:.2f}%",
-                        ],
-                        "Sharpe": [
-                            f"{result.stats.port.sharpe_ratio:.2f}",
-                            f"{result.stats.bench.sharpe_ratio:.2f}",
-                        ],
-                        "Sortino": [
-                            f"{result.stats.port.sortino_ratio:.2f}",
-                            f"{result.stats.bench.sortino_ratio:.2f}",
-                        ],
-                        "StdDev": [
-                            f"{result.stats.port.standard_dev:.2f}%",
-                            f"{result.stats.bench.standard_dev:.2f}%",
-                        ],
-                        "Correl/Bench": [f"{result.stats.correlation:.2f}", "-"],
-                        "R-Squared": [f"{result.stats.r_squared:.2f}", "-"],
-                        "Beta": [f"{result.stats.beta:.2f}", "-"],
-                        "Alpha": [f"{result.stats.alpha:.2f}%", "-"],
-                    }
+                    # Create DataFrame structure from the metric tables
+                    stats = result.stats
+                    port, bench = stats.port, stats.bench
+                    stats_data = {"": ["Screen", "S&P 500 (SPY:USA)"]}  # Index names
+                    for label, attr, fmt in PORTFOLIO_STATS:
+                        stats_data[label] = [fmt % getattr(port, attr), fmt % getattr(bench, attr)]
+                    for label, attr, fmt in RELATIVE_STATS:
+                        stats_data[label] = [fmt % getattr(stats, attr), "-"]
 
                     # Create DataFrame
                     stats_df = pd.DataFrame(stats_data)
@@ -484,27 +663,27 @@ with tab2:
                         stats_df,
                         use_container_width=True,
                         hide_index=False,
-                        column_config={
-                            "Total Return": st.column_config.NumberColumn(format="%.2f%%"),
-                            "Annualized Return": st.column_config.NumberColumn(format="%.2f%%"),
-                            "Max Drawdown": st.column_config.NumberColumn(format="%.2f%%"),
-                            "Sharpe": st.column_config.NumberColumn(format="%.2f"),
-                            "Sortino": st.column_config.NumberColumn(format="%.2f"),
-                            "StdDev": st.column_config.NumberColumn(format="%.2f%%"),
-                            "Correl/Bench": st.column_config.NumberColumn(format="%.2f"),
-                            "R-Squared": st.column_config.NumberColumn(format="%.2f"),
-                            "Beta": st.column_config.NumberColumn(format="%.2f"),
-                            "Alpha": st.column_config.NumberColumn(format="%.2f%%"),
-                        },
+                        column_config=STATS_COLUMN_CONFIG,
                     )
 
                 # Display raw data in expandable section
                 with st.expander("Raw Data"):
                     st.write(result)
 
-        except Exception as e:
-            st.error(f"Error running screen backtest: {str(e)}")
-            if "401" in str(e):
+        except ClientException as e:
+            st.error(f"Error running screen backtest: {e}")
+            if _is_auth_failure(e):
                 st.error(
                     "Authentication failed. Please check your API credentials in the .env file."
                 )
+        except Exception as e:
+            st.error(f"Error running screen backtest: {str(e)}")
+
+
+# Rank Performance Tab
+with tab1:
+    rank_performance_tab()
+
+# Screen Backtest Tab
+with tab2:
+    screen_backtest_tab()
@@ -1,12 +1,30 @@
 """Portfolio123 API client package."""
 
-# Re-export main classes for easier imports
-from p123api import ClientException
+import importlib
+from typing import TYPE_CHECKING, Any
 
-from .cache import CacheConfig, cached_api_call
-from .client import Client, get_credentials
-from .rank_performance import CachedRankPerformanceAPI, RankPerformanceAPI
-from .screen_run import CachedScreenRunAPI, ScreenRunAPI
+if TYPE_CHECKING:
+    from p123api import ClientException
+
+    from .cache import CacheConfig, cached_api_call
+    from .client import Client, get_credentials
+    from .rank_performance import CachedRankPerformanceAPI, RankPerformanceAPI
+    from .screen_run import CachedScreenRunAPI, EnhancedScreenRunAPI, ScreenRunAPI
+
+# Re-export main classes for easier imports. Submodules are imported on first access
+# (PEP 562) so that using one API doesn't pay for pandas, sqlite and the others.
+_LAZY_IMPORTS = {
+    "Client": ("p123api_client.client", "Client"),
+    "ClientException": ("p123api", "ClientException"),
+    "get_credentials": ("p123api_client.client", "get_credentials"),
+    "ScreenRunAPI": ("p123api_client.screen_run", "ScreenRunAPI"),
+    "CachedScreenRunAPI": ("p123api_client.screen_run", "CachedScreenRunAPI"),
+    "EnhancedScreenRunAPI": ("p123api_client.screen_run", "EnhancedScreenRunAPI"),
+    "RankPerformanceAPI": ("p123api_client.rank_performance", "RankPerformanceAPI"),
+    "CachedRankPerformanceAPI": ("p123api_client.rank_performance", "CachedRankPerformanceAPI"),
+    "CacheConfig": ("p123api_client.cache", "CacheConfig"),
+    "cached_api_call": ("p123api_client.cache", "cached_api_call"),
+}
 
 __all__ = [
     "Client",
@@ -14,8 +32,24 @@ __all__ = [
     "get_credentials",
     "ScreenRunAPI",
     "CachedScreenRunAPI",
+    "EnhancedScreenRunAPI",
     "RankPerformanceAPI",
     "CachedRankPerformanceAPI",
     "CacheConfig",
     "cached_api_call",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import a re-exported name on first access and cache it in the module."""
+    try:
+        module_name, attr = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
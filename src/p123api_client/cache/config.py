@@ -5,11 +5,13 @@ The cache location can be configured via the P123_CACHE_PATH environment variabl
 """
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
+SQLITE_SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class CacheConfig:
     """Configuration for the caching system.
 
@@ -21,6 +23,9 @@ class CacheConfig:
 
     For most users, no configuration is needed - just use EnhancedScreenRunAPI
     which will use these defaults automatically.
+
+    Instances are immutable and hashable; use ``dataclasses.replace`` to derive a
+    modified configuration.
     """
 
     # Path to SQLite database (can be overridden with P123_CACHE_PATH env var)
@@ -38,10 +43,34 @@ class CacheConfig:
     auto_cleanup: bool = True
     enable_statistics: bool = True
 
+    # How long an API call that returned None is remembered, so bursts of retries
+    # don't refetch it (0, the default, disables this)
+    negative_ttl_seconds: int = 0
+
+    # Puts are queued and written in one transaction once this many are pending or the
+    # oldest has waited write_flush_interval_ms (checked on the next cache call, on
+    # close and at exit). Other processes only see queued entries after the flush,
+    # so the default of 1 writes every put immediately
+    write_batch_size: int = 1
+    write_flush_interval_ms: int = 50
+
+    # Recently used entries kept in process memory in front of SQLite (0 disables).
+    # Entries are copied in and out, so callers may mutate the results they get
+    mem_cache_entries: int = 512
+
+    # SQLite tuning applied to every connection; NORMAL is crash-safe under WAL
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_cache_size_kb: int = 64 * 1024
+    sqlite_mmap_size_mb: int = 256
+    sqlite_busy_timeout_ms: int = 5000
+
+    # Resolved once in __post_init__; resolve() touches the filesystem
+    _db_path_expanded: Path = field(init=False, repr=False, compare=False)
+
     @property
     def db_path_expanded(self) -> Path:
         """Get the expanded database path."""
-        return Path(self.db_path).expanduser().resolve()
+        return self._db_path_expanded
 
     def __post_init__(self):
         """Validate configuration after initialization."""
@@ -52,3 +81,9 @@ class CacheConfig:
                 raise ValueError
         except (ValueError, TypeError):
             raise ValueError("refresh_time must be in HH:MM format")
+
+        if self.sqlite_synchronous.upper() not in SQLITE_SYNCHRONOUS_MODES:
+            raise ValueError(f"sqlite_synchronous must be one of {SQLITE_SYNCHRONOUS_MODES}")
+
+        # Frozen dataclass, so derived fields are set through object.__setattr__
+        object.__setattr__(self, "_db_path_expanded", Path(self.db_path).expanduser().resolve())
@@ -6,20 +6,31 @@ This module provides decorators for adding caching functionality to API methods.
 import base64
 import functools
 import inspect
-import json
 import logging
 import pickle
 from collections.abc import Callable
 from typing import Any, TypeVar, cast
 
+from .keys import canonical_params, generate_cache_key_from_canonical
 from .manager import CacheManager
+from .storage import NegativeResult
 
 logger = logging.getLogger(__name__)
 
 F = TypeVar("F", bound=Callable[..., Any])
 
 
-def cached_api_call(endpoint: str) -> Callable[[F], F]:
+# Cached in place of a None result; a None from the cache itself means a miss
+NEGATIVE_RESULT = NegativeResult()
+
+
+def _is_negative_result(value: Any) -> bool:
+    """Check whether a cached value is the negative-result marker."""
+    # Storage and the memory layer hand back copies, so compare by type
+    return isinstance(value, NegativeResult)
+
+
+def cached_api_call(endpoint: str, write_through: bool = False) -> Callable[[F], F]:
     """Decorator to add caching to API methods.
 
     This decorator can be applied to methods of API classes that have a
@@ -28,6 +39,8 @@ def cached_api_call(endpoint: str) -> Callable[[F], F]:
 
     Args:
         endpoint: The API endpoint for this method (used as part of the cache key)
+        write_through: Whether `bypass_cache=True` calls should store their fresh
+            result in the cache instead of discarding it
 
     Returns:
         Decorated function with caching capabilities
@@ -46,26 +59,32 @@ def cached_api_call(endpoint: str) -> Callable[[F], F]:
 
     Note:
         The decorated method can accept a `bypass_cache` parameter which, when True,
-        will bypass the cache and make a fresh API call.
+        will bypass the cache and make a fresh API call. Passing `refresh_cache=True`
+        also skips the cache lookup, but stores the fresh result under the usual key.
     """
 
     def decorator(func: F) -> F:
-        @functools.wraps(func)
-        def wrapper(self, *args, bypass_cache: bool = False, **kwargs):
-            # Create a copy of kwargs without bypass_cache to pass to the original function
-            func_kwargs = {k: v for k, v in kwargs.items() if k != "bypass_cache"}
+        # Inspect the signature once here rather than on every call
+        parameters = inspect.signature(func).parameters
+        forwards_bypass = "bypass_cache" in parameters
+        param_names = tuple(parameters)[1:]  # Skip 'self'
 
-            # Skip cache if requested or if no cache manager is available
-            if bypass_cache or not hasattr(self, "cache_manager"):
+        @functools.wraps(func)
+        def wrapper(self, *args, bypass_cache: bool = False, refresh_cache: bool = False, **kwargs):
+            # bypass_cache is keyword-only on the wrapper, so kwargs never contains it
+            func_kwargs = kwargs
+            if forwards_bypass and (bypass_cache or refresh_cache):
+                # Nested cached calls made by func must fetch fresh data as well
+                func_kwargs = {**kwargs, "bypass_cache": True}
+            if write_through and bypass_cache:
+                bypass_cache, refresh_cache = False, True
+
+            # Skip cache if requested, or before any key work if caching is unavailable
+            cache_manager: CacheManager | None = getattr(self, "cache_manager", None)
+            if bypass_cache or cache_manager is None or not cache_manager.config.enabled:
                 logger.debug(f"Bypassing cache for {endpoint}")
                 return func(self, *args, **func_kwargs)
 
-            cache_manager = cast(CacheManager, self.cache_manager)
-
-            # Extract parameter names from function signature
-            sig = inspect.signature(func)
-            param_names = list(sig.parameters.keys())[1:]  # Skip 'self'
-
             # Build params dict from args and kwargs
             params: dict[str, Any] = {}
 
@@ -73,38 +92,41 @@ def cached_api_call(endpoint: str) -> Callable[[F], F]:
             for i, arg in enumerate(args):
                 if i < len(param_names):
                     # Skip 'bypass_cache' parameter
-                    if param_names[i] != "bypass_cache":
+                    if param_names[i] != "bypass_cache" and arg is not None:
                         params[param_names[i]] = arg
 
-            # Add keyword args (excluding bypass_cache)
+            # Add keyword args; None values never affect the key
             for key, value in kwargs.items():
-                if key != "bypass_cache":
+                if value is not None:
                     params[key] = value
 
-            # Normalize parameters for consistent cache keys
+            # Serialize parameters once; the same bytes are hashed into the key and
+            # stored with the entry for invalidate_matching
             try:
-                # Convert complex objects to basic types for consistent serialization
-                serialized = json.dumps(
-                    params, default=lambda o: o.__dict__ if hasattr(o, "__dict__") else str(o)
-                )
-                normalized_params = json.loads(serialized)
+                canonical = canonical_params(params)
             except (TypeError, ValueError) as e:
                 logger.warning(f"Could not normalize parameters for caching: {e}")
-                normalized_params = params
+                return func(self, *args, **func_kwargs)
+            cache_key = generate_cache_key_from_canonical(endpoint, canonical)
 
             # Try to get from cache first
-            cached_result = cache_manager.get(endpoint, normalized_params)
+            cached_result = (
+                None if refresh_cache else cache_manager.get(endpoint, params, key=cache_key)
+            )
             if cached_result is not None:
                 logger.debug(f"Cache hit for {endpoint}")
-                # If the cached result is a serialized object, deserialize it
+                if _is_negative_result(cached_result):
+                    return None
+                # Entries cached before DataFrames were stored natively hold a pickle
                 if isinstance(cached_result, dict) and cached_result.get("__serialized__") == True:
                     try:
                         serialized_data = cached_result.get("data")
                         if serialized_data:
                             logger.debug("Deserializing cached result")
-                            decoded_data = base64.b64decode(serialized_data)
-                            deserialized_result = pickle.loads(decoded_data)
-                            return deserialized_result
+                            if isinstance(serialized_data, str):
+                                # Entries cached before payloads were stored as raw bytes
+                                serialized_data = base64.b64decode(serialized_data)
+                            return pickle.loads(serialized_data)
                     except Exception as e:
                         logger.warning(f"Failed to deserialize cached result: {e}")
                 return cached_result
@@ -113,27 +135,19 @@ def cached_api_call(endpoint: str) -> Callable[[F], F]:
             logger.debug(f"Cache miss for {endpoint}, calling API")
             result = func(self, *args, **func_kwargs)
 
-            # Store result in cache - handle special types like DataFrames
-            try:
-                import pandas as pd
-
-                if isinstance(result, pd.DataFrame):
-                    # Serialize DataFrame to avoid string representation issues
-                    logger.debug("Serializing DataFrame result for caching")
-                    serialized_data = pickle.dumps(result)
-                    encoded_data = base64.b64encode(serialized_data).decode("ascii")
-                    serialized_result = {
-                        "__serialized__": True,
-                        "type": "pandas.DataFrame",
-                        "data": encoded_data,
-                    }
-                    cache_manager.put(endpoint, normalized_params, serialized_result)
-                else:
-                    cache_manager.put(endpoint, normalized_params, result)
-            except Exception as e:
-                logger.warning(f"Failed to serialize result for caching: {e}")
-                # Still store the original result even if serialization fails
-                cache_manager.put(endpoint, normalized_params, result)
+            # Store result in cache; the storage layer writes DataFrames as Feather
+            if result is not None:
+                cache_manager.put(endpoint, params, result, key=cache_key, canonical=canonical)
+            elif cache_manager.config.negative_ttl_seconds > 0:
+                # Remember the empty answer briefly so retries skip the API call
+                cache_manager.put(
+                    endpoint,
+                    params,
+                    NEGATIVE_RESULT,
+                    force_ttl=cache_manager.config.negative_ttl_seconds,
+                    key=cache_key,
+                    canonical=canonical,
+                )
 
             return result
 
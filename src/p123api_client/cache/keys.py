@@ -1,10 +1,17 @@
 """Cache key generation utilities."""
 
-import hashlib
-import json
-from datetime import datetime
 from typing import Any
 
+import orjson
+import xxhash
+
+# Part of every hashed key; bump it whenever key derivation changes so rows written
+# under the old scheme are treated as misses instead of being looked up by mistake
+CACHE_KEY_VERSION = 5
+
+# Options every canonical parameter serialization must use so equal params hash equally
+CANONICAL_JSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
 
 def generate_cache_key(endpoint: str, params: dict[str, Any]) -> str:
     """Generate a cache key from endpoint and parameters.
@@ -16,44 +23,70 @@ def generate_cache_key(endpoint: str, params: dict[str, Any]) -> str:
     Returns:
         A deterministic hash string representing the endpoint + parameters
     """
-    # Normalize parameters
-    normalized = {k: _normalize_value(v) for k, v in params.items() if v is not None}
-
-    # Sort for consistency and convert to string
-    param_str = json.dumps(normalized, sort_keys=True)
-
-    # Generate key as SHA-256 hash
-    return hashlib.sha256(f"{endpoint}:{param_str}".encode()).hexdigest()
+    return generate_cache_key_from_canonical(endpoint, canonical_params(params))
 
 
-def _normalize_value(value: Any) -> Any:
-    """Normalize a value for consistent cache key generation.
+def canonical_params(params: dict[str, Any]) -> bytes:
+    """Serialize parameters to the canonical bytes cache keys are derived from.
 
     Args:
-        value: The value to normalize
+        params: The parameters passed to the endpoint
 
     Returns:
-        A normalized version of the value suitable for consistent serialization
+        Sorted, compact JSON bytes; equal parameters always give equal bytes
     """
-    # Handle None
-    if value is None:
-        return None
+    # None-valued entries never affect the key; rebuild only when there are some
+    if _has_none_values(params):
+        params = _drop_none_values(params)
 
-    # Handle dictionaries
-    if isinstance(value, dict):
-        return {k: _normalize_value(v) for k, v in value.items() if v is not None}
+    # Sort for consistency and serialize straight to bytes; orjson handles datetimes
+    # itself and _json_default covers objects it doesn't know
+    return orjson.dumps(params, default=_json_default, option=CANONICAL_JSON_OPTIONS)
 
-    # Handle lists/tuples
-    if isinstance(value, (list, tuple)):
-        return [_normalize_value(v) for v in value]
 
-    # Handle datetime objects
-    if isinstance(value, datetime):
-        return value.isoformat()
+def generate_cache_key_from_canonical(endpoint: str, canonical: bytes) -> str:
+    """Generate a cache key from endpoint and already-serialized parameters.
 
-    # Handle basic types
-    if isinstance(value, (str, int, float, bool)):
-        return value
+    Args:
+        endpoint: The API endpoint name
+        canonical: The parameters as `orjson.dumps(..., option=CANONICAL_JSON_OPTIONS)`
 
-    # Convert other types to string
-    return str(value)
+    Returns:
+        A deterministic hash string representing the endpoint + parameters
+    """
+    # Generate key as a non-cryptographic XXH3 hash; keys are only local lookup ids
+    prefix = f"v{CACHE_KEY_VERSION}:{endpoint}:".encode()
+    return xxhash.xxh3_128_hexdigest(prefix + canonical)
+
+
+def _json_default(o: Any) -> Any:
+    """Serialize parameter objects by their attributes, or their string form if they have none.
+
+    Attributes rather than str() keep reprs carrying memory addresses out of the key.
+    """
+    return o.__dict__ if hasattr(o, "__dict__") else str(o)
+
+
+def _has_none_values(value: Any) -> bool:
+    """Check whether any dict nested in value (including value itself) holds a None."""
+    stack = [value]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            for item in current.values():
+                if item is None:
+                    return True
+                if isinstance(item, (dict, list, tuple)):
+                    stack.append(item)
+        elif isinstance(current, (list, tuple)):
+            stack.extend(item for item in current if isinstance(item, (dict, list, tuple)))
+    return False
+
+
+def _drop_none_values(value: Any) -> Any:
+    """Copy value without the None-valued entries of any nested dict."""
+    if isinstance(value, dict):
+        return {k: _drop_none_values(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_drop_none_values(v) for v in value]
+    return value
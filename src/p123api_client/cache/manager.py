@@ -1,21 +1,42 @@
 """Cache manager implementation."""
 
+import atexit
+import copy
 import logging
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from datetime import datetime, time, timedelta, timezone
+from functools import partial
+from time import monotonic
 from typing import Any
+from zoneinfo import ZoneInfo
 
-import pytz
+import orjson
 
 from .config import CacheConfig
-from .keys import generate_cache_key
+from .keys import canonical_params, generate_cache_key, generate_cache_key_from_canonical
 from .storage import SQLiteStorage
 
 logger = logging.getLogger(__name__)
 
 
+def _flush_at_exit(manager_ref: "weakref.ref[CacheManager]") -> None:
+    """Write out queued entries and buffered statistics of a manager never closed."""
+    manager = manager_ref()
+    if manager is not None:
+        manager._flush_writes()
+        manager._flush_stats()
+
+
 class CacheManager:
     """Manages caching operations and coordinates components."""
 
+    # Hits and misses are buffered in memory and written once this many have accumulated
+    STATS_FLUSH_THRESHOLD = 100
+
     def __init__(self, config: CacheConfig | None = None):
         """Initialize cache manager.
 
@@ -24,68 +45,126 @@ class CacheManager:
         """
         self.config = config or CacheConfig()
         self.storage = SQLiteStorage(
-            str(self.config.db_path_expanded), max_cache_size_mb=self.config.max_cache_size_mb
+            str(self.config.db_path_expanded),
+            max_cache_size_mb=self.config.max_cache_size_mb,
+            synchronous=self.config.sqlite_synchronous,
+            cache_size_kb=self.config.sqlite_cache_size_kb,
+            mmap_size_mb=self.config.sqlite_mmap_size_mb,
+            busy_timeout_ms=self.config.sqlite_busy_timeout_ms,
         )
         self.logger = logger
 
         # Initialize timezone
-        self._tz = pytz.timezone(self.config.timezone)
+        self._tz = ZoneInfo(self.config.timezone)
 
         # Parse refresh time
         hour, minute = map(int, self.config.refresh_time.split(":"))
         self._refresh_time = time(hour=hour, minute=minute)
 
-    def get(self, endpoint: str, params: dict[str, Any], bypass_cache: bool = False) -> Any | None:
+        # Statistics not yet written to SQLite
+        self._hit_buf = 0
+        self._miss_buf = 0
+        self._stats_lock = threading.Lock()
+        # A per-instance callable so close() can unregister just this manager
+        self._exit_hook = partial(_flush_at_exit, weakref.ref(self))
+        atexit.register(self._exit_hook)
+
+        # In-process LRU of key -> (endpoint, expires_at, data) so hot hits skip SQLite
+        self._mem: OrderedDict[str, tuple[str, datetime, Any]] = OrderedDict()
+        self._mem_lock = threading.Lock()
+
+        # Write-behind queue of key -> (data, endpoint, expires_at, params_blob) not yet
+        # in SQLite
+        self._pending_writes: dict[str, tuple[Any, str, datetime, bytes]] = {}
+        self._pending_since = 0.0
+        self._write_lock = threading.Lock()
+
+    def get(
+        self,
+        endpoint: str,
+        params: dict[str, Any],
+        bypass_cache: bool = False,
+        key: str | None = None,
+    ) -> Any | None:
         """Get a value from the cache.
 
         Args:
             endpoint: API endpoint name
             params: API call parameters
             bypass_cache: Whether to bypass the cache
+            key: Optional precomputed cache key; params are not hashed when given
 
         Returns:
             Cached value if found and valid, None otherwise
         """
         if not self.config.enabled or bypass_cache:
-            # Track miss in SQLite if statistics are enabled
+            # Track miss if statistics are enabled
             if self.config.enable_statistics:
-                self.storage.update_statistics(0, 1)
+                self._record_stats(0, 1)
             return None
 
         # Generate cache key
-        key = generate_cache_key(endpoint, params)
+        if key is None:
+            key = generate_cache_key(endpoint, params)
+
+        # Serve hot keys from memory
+        now = datetime.now(timezone.utc)
+        with self._mem_lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._mem.move_to_end(key)
+                else:
+                    del self._mem[key]
+                    entry = None
+        if entry is not None:
+            if self.config.enable_statistics:
+                self._record_stats(1, 0)
+            # Hand out a copy so callers mutating results can't alter later hits
+            return copy.deepcopy(entry[2])
+
+        # Queued writes are not in SQLite yet
+        if self._pending_writes:
+            with self._write_lock:
+                pending = self._pending_writes.get(key)
+            if pending is not None and pending[2] > now:
+                if self.config.enable_statistics:
+                    self._record_stats(1, 0)
+                return copy.deepcopy(pending[0])
+            self._maybe_flush_writes()
 
         # Get from storage
         data, metadata = self.storage.retrieve(key)
         if data is None:
-            # Track miss in SQLite if statistics are enabled
+            # Track miss if statistics are enabled
             if self.config.enable_statistics:
-                self.storage.update_statistics(0, 1)
+                self._record_stats(0, 1)
             return None
 
-        # Check if expired - ensure both datetimes have timezone info
-        now = datetime.now(timezone.utc)
+        # Check if expired; storage always returns timezone-aware UTC datetimes
         expires_at = metadata["expires_at"]
-
-        # If expires_at doesn't have timezone info, assume UTC
-        if expires_at.tzinfo is None:
-            expires_at = expires_at.replace(tzinfo=timezone.utc)
-
         if expires_at <= now:
             self.storage.delete(key)
-            # Track miss in SQLite if statistics are enabled
+            # Track miss if statistics are enabled
             if self.config.enable_statistics:
-                self.storage.update_statistics(0, 1)
+                self._record_stats(0, 1)
             return None
 
-        # Track hit in SQLite if statistics are enabled
+        # Track hit if statistics are enabled
         if self.config.enable_statistics:
-            self.storage.update_statistics(1, 0)
+            self._record_stats(1, 0)
 
+        self._remember(key, endpoint, expires_at, data)
         return data
 
     def put(
-        self, endpoint: str, params: dict[str, Any], data: Any, force_ttl: int | None = None
+        self,
+        endpoint: str,
+        params: dict[str, Any],
+        data: Any,
+        force_ttl: int | None = None,
+        key: str | None = None,
+        canonical: bytes | None = None,
     ) -> bool:
         """Put a value in the cache.
 
@@ -94,6 +173,9 @@ class CacheManager:
             params: API call parameters
             data: Data to cache
             force_ttl: Optional TTL override in seconds
+            key: Optional precomputed cache key; params are not hashed when given
+            canonical: Optional `canonical_params(params)` bytes the key was derived
+                from; params are not serialized again when given
 
         Returns:
             True if storage successful
@@ -104,22 +186,153 @@ class CacheManager:
         # Debug logging for troubleshooting serialization issues
         self.logger.debug(f"Caching data of type: {type(data)}")
         try:
-            # Generate cache key
-            key = generate_cache_key(endpoint, params)
+            # Keep the canonical params alongside the entry so it can be matched later
+            params_blob = canonical if canonical is not None else canonical_params(params)
+            if key is None:
+                key = generate_cache_key_from_canonical(endpoint, params_blob)
 
             # Calculate expiration
             expires_at = (
-                (datetime.now().astimezone(pytz.UTC) + timedelta(seconds=force_ttl))
+                (datetime.now(timezone.utc) + timedelta(seconds=force_ttl))
                 if force_ttl
                 else self._calculate_next_refresh()
             )
 
+            # Queue the write when batching, unless a bulk transaction is already open
+            if self.config.write_batch_size > 1 and not self.storage.in_transaction():
+                with self._write_lock:
+                    if not self._pending_writes:
+                        self._pending_since = monotonic()
+                    # Queue a private copy; the caller may mutate data before the flush
+                    self._pending_writes[key] = (
+                        copy.deepcopy(data),
+                        endpoint,
+                        expires_at,
+                        params_blob,
+                    )
+                self._remember(key, endpoint, expires_at, data)
+                self._maybe_flush_writes()
+                return True
+
             # Store data
-            return self.storage.store(key, data, endpoint, expires_at)
+            stored = self.storage.store(key, data, endpoint, expires_at, params_blob)
+            if stored:
+                self._remember(key, endpoint, expires_at, data)
+            return stored
         except Exception as e:
             self.logger.error(f"Error storing cache entry: {str(e)}")
             return False
 
+    def put_many(
+        self, entries: list[tuple[str, dict[str, Any], Any]], force_ttl: int | None = None
+    ) -> bool:
+        """Put several values in the cache with a single batched write.
+
+        Args:
+            entries: List of (endpoint, params, data) tuples
+            force_ttl: Optional TTL override in seconds
+
+        Returns:
+            True if storage successful
+        """
+        if not self.config.enabled:
+            return False
+
+        try:
+            # Every entry in the batch shares one expiration
+            expires_at = (
+                (datetime.now(timezone.utc) + timedelta(seconds=force_ttl))
+                if force_ttl
+                else self._calculate_next_refresh()
+            )
+            rows = []
+            for endpoint, params, data in entries:
+                params_blob = canonical_params(params)
+                key = generate_cache_key_from_canonical(endpoint, params_blob)
+                rows.append((key, data, endpoint, expires_at, params_blob))
+            stored = self.storage.store_many(rows)
+            if stored:
+                for key, data, endpoint, _, _ in rows:
+                    self._remember(key, endpoint, expires_at, data)
+            return stored
+        except Exception as e:
+            self.logger.error(f"Error storing cache entries: {str(e)}")
+            return False
+
+    def _maybe_flush_writes(self) -> None:
+        """Flush the write-behind queue if it's full or has waited long enough."""
+        pending = len(self._pending_writes)
+        if pending and (
+            pending >= self.config.write_batch_size
+            or (monotonic() - self._pending_since) * 1000 >= self.config.write_flush_interval_ms
+        ):
+            self._flush_writes()
+
+    def _flush_writes(self) -> bool:
+        """Write all queued puts to SQLite in a single transaction.
+
+        Returns:
+            True if there was nothing to write or the write succeeded
+        """
+        with self._write_lock:
+            pending, self._pending_writes = self._pending_writes, {}
+        if not pending:
+            return True
+        rows = [(key, *entry) for key, entry in pending.items()]
+        return self.storage.store_many(rows)
+
+    @contextmanager
+    def bulk(self) -> Iterator["CacheManager"]:
+        """Group the cache reads and writes made inside the block into one transaction.
+
+        Example:
+            ```python
+            with api.cache_manager.bulk():
+                for formula in formulas:
+                    api.run_simple_screen("SP500", formula)
+            ```
+        """
+        self._flush_writes()
+        try:
+            with self.storage.transaction():
+                yield self
+        except BaseException:
+            # Entries remembered inside the block were rolled back in SQLite
+            self._forget()
+            raise
+
+    def _remember(self, key: str, endpoint: str, expires_at: datetime, data: Any) -> None:
+        """Keep a private copy of an entry in the in-memory LRU, evicting the least recently used."""
+        capacity = self.config.mem_cache_entries
+        if capacity <= 0:
+            return
+        # The caller keeps (and may mutate) the object it passed in
+        data = copy.deepcopy(data)
+        with self._mem_lock:
+            self._mem[key] = (endpoint, expires_at, data)
+            self._mem.move_to_end(key)
+            while len(self._mem) > capacity:
+                self._mem.popitem(last=False)
+
+    def _forget(self, endpoint: str | None = None) -> None:
+        """Drop in-memory entries, optionally only those of one endpoint."""
+        with self._mem_lock:
+            if endpoint is None:
+                self._mem.clear()
+            else:
+                for key in [k for k, entry in self._mem.items() if entry[0] == endpoint]:
+                    del self._mem[key]
+
+    def _discard_pending_writes(self, endpoint: str | None = None) -> None:
+        """Drop queued writes, optionally only those of one endpoint."""
+        with self._write_lock:
+            if endpoint is None:
+                self._pending_writes.clear()
+            else:
+                self._pending_writes = {
+                    k: entry for k, entry in self._pending_writes.items() if entry[1] != endpoint
+                }
+
     def _calculate_next_refresh(self) -> datetime:
         """Calculate the next P123 data refresh time.
 
@@ -138,7 +351,7 @@ class CacheManager:
             refresh = refresh + timedelta(days=1)
 
         # Convert to UTC for storage
-        return refresh.astimezone(pytz.UTC)
+        return refresh.astimezone(timezone.utc)
 
     def invalidate_endpoint(self, endpoint: str) -> bool:
         """Invalidate cache for a specific endpoint.
@@ -149,15 +362,42 @@ class CacheManager:
         Returns:
             True if the operation was successful
         """
+        self._forget(endpoint)
+        self._discard_pending_writes(endpoint)
         # Use the storage's delete_by_endpoint method to remove only entries for this endpoint
         return self.storage.delete_by_endpoint(endpoint)
 
+    def invalidate_matching(
+        self, endpoint: str, match: dict[str, Any] | Callable[[dict[str, Any]], bool]
+    ) -> bool:
+        """Invalidate the cache entries of an endpoint stored with matching parameters.
+
+        Args:
+            endpoint: The endpoint to invalidate
+            match: Parameters to match exactly, or a predicate called with the
+                stored parameters of each entry
+
+        Returns:
+            True if the operation was successful
+        """
+        # The in-memory layer doesn't keep params, so drop the whole endpoint there
+        self._forget(endpoint)
+        self._flush_writes()
+        if callable(match):
+            return self.storage.delete_where_params(
+                endpoint, lambda params_blob: match(orjson.loads(params_blob))
+            )
+        # Exact matches compare canonical bytes in SQL, with no per-row decoding
+        return self.storage.delete_by_params(endpoint, canonical_params(match))
+
     def invalidate_all(self) -> bool:
         """Invalidate all cached data.
 
         Returns:
             True if the operation was successful
         """
+        self._forget()
+        self._discard_pending_writes()
         result = self.storage.clear()
         return result is not None
 
@@ -169,12 +409,30 @@ class CacheManager:
         self.invalidate_all()
         self.logger.info("Cache forcibly invalidated due to P123 data update")
 
+    def _record_stats(self, hits: int, misses: int) -> None:
+        """Buffer hits and misses, writing them out once enough have accumulated."""
+        with self._stats_lock:
+            self._hit_buf += hits
+            self._miss_buf += misses
+            pending = self._hit_buf + self._miss_buf
+        if pending >= self.STATS_FLUSH_THRESHOLD:
+            self._flush_stats()
+
+    def _flush_stats(self) -> None:
+        """Write buffered hits and misses to SQLite in a single update."""
+        with self._stats_lock:
+            hits, misses = self._hit_buf, self._miss_buf
+            self._hit_buf = self._miss_buf = 0
+        if hits or misses:
+            self.storage.update_statistics(hits, misses)
+
     def get_stats(self) -> dict[str, Any]:
         """Get cache statistics from SQLite database.
 
         Returns:
             Dictionary of cache statistics
         """
+        self._flush_stats()
         try:
             with self.storage.get_connection() as conn:
                 # Get the latest statistics
@@ -197,4 +455,7 @@ class CacheManager:
 
     def close(self):
         """Close cache manager and release resources."""
+        atexit.unregister(self._exit_hook)
+        self._flush_writes()
+        self._flush_stats()
         self.storage.close()
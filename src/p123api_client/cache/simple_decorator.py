@@ -7,12 +7,13 @@ to enable caching with minimal code changes.
 import base64
 import functools
 import inspect
-import json
 import logging
 import pickle
 from typing import TypeVar
 
 from .config import CacheConfig
+from .decorators import NEGATIVE_RESULT, _is_negative_result
+from .keys import canonical_params, generate_cache_key_from_canonical
 from .manager import CacheManager
 
 logger = logging.getLogger(__name__)
@@ -67,13 +68,16 @@ def enable_cache(api_instance: T, config: CacheConfig | None = None) -> T:
 
     # Custom wrapper to avoid parameter conflicts
     def create_wrapper(func, endpoint):
+        # Inspect the signature once here rather than on every call
+        param_names = tuple(inspect.signature(func).parameters)[1:]  # Skip 'self'
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             # Extract bypass_cache if present
             bypass_cache = kwargs.pop("bypass_cache", False)
 
-            # Skip cache if requested
-            if bypass_cache:
+            # Skip cache if requested, or before any key work if caching is disabled
+            if bypass_cache or not config.enabled:
                 return func(*args, **kwargs)
 
             # Get the instance (self) from args
@@ -83,41 +87,39 @@ def enable_cache(api_instance: T, config: CacheConfig | None = None) -> T:
             # Build params dict from args and kwargs
             params = {}
 
-            # Get parameter names from function signature
-            sig = inspect.signature(func)
-            param_names = list(sig.parameters.keys())[1:]  # Skip 'self'
-
             # Add positional args with their parameter names
             for i, arg in enumerate(remaining_args):
-                if i < len(param_names):
+                if i < len(param_names) and arg is not None:
                     params[param_names[i]] = arg
 
-            # Add keyword args
-            params.update(kwargs)
+            # Add keyword args; None values never affect the key
+            params.update((k, v) for k, v in kwargs.items() if v is not None)
 
-            # Normalize parameters for consistent cache keys
+            # Serialize parameters once; the same bytes are hashed into the key and
+            # stored with the entry for invalidate_matching
             try:
-                serialized = json.dumps(
-                    params, default=lambda o: o.__dict__ if hasattr(o, "__dict__") else str(o)
-                )
-                normalized_params = json.loads(serialized)
+                canonical = canonical_params(params)
             except (TypeError, ValueError) as e:
                 logger.warning(f"Could not normalize parameters for caching: {e}")
-                normalized_params = params
+                return func(*args, **kwargs)
+            cache_key = generate_cache_key_from_canonical(endpoint, canonical)
 
             # Try to get from cache first
-            cached_result = self.cache_manager.get(endpoint, normalized_params)
+            cached_result = self.cache_manager.get(endpoint, params, key=cache_key)
             if cached_result is not None:
                 logger.debug(f"Cache hit for {endpoint}")
-                # Handle serialized objects
+                if _is_negative_result(cached_result):
+                    return None
+                # Entries cached before DataFrames were stored natively hold a pickle
                 if isinstance(cached_result, dict) and cached_result.get("__serialized__") == True:
                     try:
                         serialized_data = cached_result.get("data")
                         if serialized_data:
                             logger.debug("Deserializing cached result")
-                            decoded_data = base64.b64decode(serialized_data)
-                            deserialized_result = pickle.loads(decoded_data)
-                            return deserialized_result
+                            if isinstance(serialized_data, str):
+                                # Entries cached before payloads were stored as raw bytes
+                                serialized_data = base64.b64decode(serialized_data)
+                            return pickle.loads(serialized_data)
                     except Exception as e:
                         logger.warning(f"Failed to deserialize cached result: {e}")
                 return cached_result
@@ -126,27 +128,19 @@ def enable_cache(api_instance: T, config: CacheConfig | None = None) -> T:
             logger.debug(f"Cache miss for {endpoint}, calling API")
             result = func(*args, **kwargs)
 
-            # Store result in cache - handle special types like DataFrames
-            try:
-                import pandas as pd
-
-                if isinstance(result, pd.DataFrame):
-                    # Serialize DataFrame
-                    logger.debug("Serializing DataFrame result for caching")
-                    serialized_data = pickle.dumps(result)
-                    encoded_data = base64.b64encode(serialized_data).decode("ascii")
-                    serialized_result = {
-                        "__serialized__": True,
-                        "type": "pandas.DataFrame",
-                        "data": encoded_data,
-                    }
-                    self.cache_manager.put(endpoint, normalized_params, serialized_result)
-                else:
-                    self.cache_manager.put(endpoint, normalized_params, result)
-            except Exception as e:
-                logger.warning(f"Failed to serialize result for caching: {e}")
-                # Still store the original result even if serialization fails
-                self.cache_manager.put(endpoint, normalized_params, result)
+            # Store result in cache; the storage layer writes DataFrames as Feather
+            if result is not None:
+                self.cache_manager.put(endpoint, params, result, key=cache_key, canonical=canonical)
+            elif self.cache_manager.config.negative_ttl_seconds > 0:
+                # Remember the empty answer briefly so retries skip the API call
+                self.cache_manager.put(
+                    endpoint,
+                    params,
+                    NEGATIVE_RESULT,
+                    force_ttl=self.cache_manager.config.negative_ttl_seconds,
+                    key=cache_key,
+                    canonical=canonical,
+                )
 
             return result
 
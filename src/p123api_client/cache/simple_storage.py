@@ -7,21 +7,210 @@ It uses SQLite as the sole storage mechanism without any in-memory caching layer
 import io
 import json
 import logging
+import math
+import pickle
 import sqlite3
+import struct
 import threading
+import time
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+import orjson
 import pandas as pd
+import pyarrow as pa
 
 logger = logging.getLogger(__name__)
 
+# One-byte tags prefixed to binary payloads so retrieve() can dispatch on format
+PICKLE_TAG = b"\x00"
+ARROW_TAG = b"\x01"
+
+
+def _dataframe_to_arrow(df: pd.DataFrame) -> bytes:
+    """Serialize a DataFrame to a tagged Arrow IPC stream."""
+    table = pa.Table.from_pandas(df)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return ARROW_TAG + sink.getvalue().to_pybytes()
+
+
+def _arrow_to_dataframe(data: bytes) -> pd.DataFrame:
+    """Deserialize a tagged Arrow IPC stream back into a DataFrame."""
+    table = pa.ipc.open_stream(memoryview(data)[1:]).read_all()
+    return table.to_pandas(self_destruct=True)
+
+
+def _pickle_with_buffers(data: Any) -> bytes:
+    """Pickle with protocol 5, appending out-of-band buffers after the payload.
+
+    Layout: tag | payload length | buffer count | buffer lengths | payload | buffers
+    """
+    buffers: list[pickle.PickleBuffer] = []
+    payload = pickle.dumps(data, protocol=5, buffer_callback=buffers.append)
+    raws = [buffer.raw() for buffer in buffers]
+    header = struct.pack(f"<QI{len(raws)}Q", len(payload), len(raws), *(r.nbytes for r in raws))
+    return b"".join([PICKLE_TAG, header, payload, *raws])
+
+
+def _unpickle_with_buffers(data: bytes) -> Any:
+    """Load a value written by _pickle_with_buffers."""
+    # Copy once into a mutable buffer so reconstructed arrays stay writeable
+    view = memoryview(bytearray(data))
+    payload_len, count = struct.unpack_from("<QI", view, 1)
+    offset = 1 + struct.calcsize("<QI")
+    sizes = struct.unpack_from(f"<{count}Q", view, offset)
+    offset += 8 * count
+    payload = view[offset : offset + payload_len]
+    offset += payload_len
+    buffers = []
+    for size in sizes:
+        buffers.append(view[offset : offset + size])
+        offset += size
+    return pickle.loads(payload, buffers=buffers)
+
+
+def _is_plain_json(value: Any) -> bool:
+    """Whether a value survives a JSON round trip unchanged.
+
+    orjson would quietly turn NaN into null, datetimes, UUIDs and dataclasses into
+    strings or dicts, tuples into lists, and non-str keys into strings, so only
+    exact builtin types within orjson's integer range qualify.
+    """
+    kind = type(value)
+    if value is None or kind is str or kind is bool:
+        return True
+    if kind is int:
+        return -(2**63) <= value < 2**64
+    if kind is float:
+        return math.isfinite(value)
+    if kind is list:
+        return all(_is_plain_json(item) for item in value)
+    if kind is dict:
+        return all(type(k) is str and _is_plain_json(v) for k, v in value.items())
+    return False
+
+
+def _serialize(data: Any) -> bytes:
+    """Serialize a cache value.
+
+    DataFrames become Arrow bytes, plain JSON values UTF-8 JSON bytes, and
+    anything else protocol 5 pickle, so every value round-trips exactly.
+    """
+    if isinstance(data, pd.DataFrame):
+        return _dataframe_to_arrow(data)
+    if _is_plain_json(data):
+        return orjson.dumps(data)
+    return _pickle_with_buffers(data)
+
+
+def _deserialize_json(data: str | bytes) -> Any:
+    """Parse JSON written by _serialize, or TEXT rows from before payloads were BLOBs."""
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # Rows written by json.dumps may hold NaN/Infinity, which orjson rejects
+        return json.loads(data)
+
+
+def _to_epoch_ms(dt: datetime) -> int:
+    """Convert a datetime to Unix epoch milliseconds (naive values are local time)."""
+    return int(dt.timestamp() * 1000)
+
+
+def _now_ms() -> int:
+    """Current time in Unix epoch milliseconds."""
+    return time.time_ns() // 1_000_000
+
+
+def _from_epoch_ms(value: int | None) -> datetime | None:
+    """Convert Unix epoch milliseconds to an aware UTC datetime."""
+    return datetime.fromtimestamp(value / 1000, tz=timezone.utc) if value is not None else None
+
 
 class SimpleStorage:
     """A simplified SQLite-based storage backend for caching."""
 
+    _PRAGMAS = """
+        PRAGMA foreign_keys = ON;
+        PRAGMA journal_mode = WAL;          -- Readers don't block the writer
+        PRAGMA synchronous = NORMAL;        -- Safe under WAL, no fsync per commit
+        PRAGMA busy_timeout = 5000;
+        PRAGMA cache_size = -65536;         -- 64MB page cache
+        PRAGMA mmap_size = 268435456;       -- Memory-map up to 256MB of the file
+        PRAGMA temp_store = MEMORY;
+        PRAGMA wal_autocheckpoint = 1000;   -- Checkpoint every ~1000 pages instead of per store
+        PRAGMA recursive_triggers = ON;     -- REPLACE fires delete triggers for the old row
+    """
+
+    # Hot-path SQL kept as constant strings so sqlite3's statement cache reuses the plans
+    _SQL_INSERT = """
+        INSERT OR REPLACE INTO cache_entries
+            (key, data, endpoint, created_at, expires_at, size_bytes)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
+    _SQL_SELECT = """
+        SELECT data, endpoint, created_at, expires_at,
+               access_count, last_accessed, size_bytes
+        FROM cache_entries WHERE key = ?
+    """
+    _SQL_UPDATE_ACCESS = """
+        UPDATE cache_entries
+        SET access_count = access_count + ?, last_accessed = ?
+        WHERE key = ?
+    """
+    _SQL_DELETE = "DELETE FROM cache_entries WHERE key = ?"
+    _SQL_TOTAL_BYTES = "SELECT total_bytes FROM cache_meta WHERE id = 1"
+
+    # Room for the hot statements above plus ad-hoc queries without evictions
+    STATEMENT_CACHE_SIZE = 256
+
+    # Ghost the coldest entries, which the next statement then deletes. Each
+    # entry is scored by blending its frequency rank (weight alpha) with its
+    # recency rank (weight 1 - alpha); reused entries go on the frequent list.
+    _SQL_GHOST_COLDEST = """
+        INSERT OR REPLACE INTO cache_ghosts (key, list, evicted_at)
+        SELECT key, CASE WHEN access_count > 0 THEN ? ELSE ? END, ? FROM (
+            SELECT key, access_count,
+                   ? * PERCENT_RANK() OVER (ORDER BY access_count)
+                   + (1 - ?) * PERCENT_RANK() OVER (
+                       ORDER BY COALESCE(last_accessed, created_at)
+                   ) AS score
+            FROM cache_entries
+        )
+        ORDER BY score ASC
+        LIMIT ?
+    """
+    _SQL_DELETE_GHOSTED = """
+        DELETE FROM cache_entries
+        WHERE key IN (SELECT key FROM cache_ghosts WHERE evicted_at = ?)
+    """
+    _SQL_TRIM_GHOSTS = """
+        DELETE FROM cache_ghosts WHERE key NOT IN (
+            SELECT key FROM cache_ghosts ORDER BY evicted_at DESC LIMIT ?
+        )
+    """
+    _SQL_SELECT_GHOSTS = """
+        SELECT key, list FROM cache_ghosts
+        WHERE key IN (SELECT value FROM json_each(?))
+    """
+    _SQL_DELETE_GHOST = "DELETE FROM cache_ghosts WHERE key = ?"
+    _SQL_SAVE_ALPHA = "INSERT OR REPLACE INTO policy_state (name, value) VALUES ('alpha', ?)"
+
+    # Ghost lists remember recently evicted keys (ARC's B1/B2) so a re-request
+    # tells us whether recency or frequency should have protected the entry
+    GHOST_RECENT = 1
+    GHOST_FREQUENT = 2
+    MAX_GHOSTS = 1024
+    ALPHA_STEP = 0.01
+
+    # Access stats from cache hits are written in batches rather than per read
+    ACCESS_FLUSH_THRESHOLD = 100
+    ACCESS_FLUSH_INTERVAL_SECONDS = 5.0
+
     def __init__(self, db_path: str, max_cache_size_mb: int = 100):
         """Initialize SQLite storage.
 
@@ -30,9 +219,16 @@ class SimpleStorage:
             max_cache_size_mb: Maximum cache size in megabytes
         """
         self.db_path = Path(db_path).expanduser().resolve()
-        self._connection_pool = {}
+        # Each thread finds its own connection without locking; the list is
+        # only touched on connect and close so close() can reach them all
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
         self._lock = threading.RLock()
         self.max_cache_size_mb = max_cache_size_mb
+        self._alpha = 0.5
+        # key -> (hits not yet written, last access time)
+        self._pending_access: dict[str, tuple[int, int]] = {}
+        self._last_access_flush = time.monotonic()
 
         # Ensure parent directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -40,6 +236,15 @@ class SimpleStorage:
         # Initialize database
         self._init_db()
 
+        # Prewarm the connection so the first store/retrieve doesn't pay for
+        # schema loading and statement compilation
+        with self.get_connection() as conn:
+            conn.execute("SELECT 1 FROM cache_entries LIMIT 1").fetchall()
+            conn.execute(self._SQL_SELECT, ("",)).fetchall()
+            row = conn.execute("SELECT value FROM policy_state WHERE name = 'alpha'").fetchone()
+            if row is not None:
+                self._alpha = row[0]
+
     def _init_db(self):
         """Initialize database schema."""
         with self.get_connection() as conn:
@@ -47,12 +252,12 @@ class SimpleStorage:
                 -- Cache entries table
                 CREATE TABLE IF NOT EXISTS cache_entries (
                     key TEXT PRIMARY KEY,
-                    data TEXT NOT NULL,  -- Using TEXT instead of BLOB for better inspection
+                    data BLOB NOT NULL,  -- JSON, or tagged Arrow/pickle bytes
                     endpoint TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    expires_at TEXT NOT NULL,
+                    created_at INTEGER NOT NULL,  -- Unix epoch milliseconds
+                    expires_at INTEGER NOT NULL,
                     access_count INTEGER DEFAULT 0,
-                    last_accessed TEXT,
+                    last_accessed INTEGER,
                     size_bytes INTEGER NOT NULL
                 );
                 
@@ -63,47 +268,145 @@ class SimpleStorage:
                     ON cache_entries(expires_at);
                 CREATE INDEX IF NOT EXISTS idx_last_accessed
                     ON cache_entries(last_accessed);
-                
-                -- Add pragma optimizations
-                PRAGMA synchronous = NORMAL;  -- Faster writes with reasonable safety
-                PRAGMA journal_mode = WAL;    -- Better concurrency
-                PRAGMA cache_size = -2000;    -- Use 2MB of memory for cache
+
+                -- Recently evicted keys and the adaptive eviction weight
+                CREATE TABLE IF NOT EXISTS cache_ghosts (
+                    key TEXT PRIMARY KEY,
+                    list INTEGER NOT NULL,  -- 1: evicted cold, 2: evicted after reuse
+                    evicted_at INTEGER NOT NULL  -- Unix epoch milliseconds
+                );
+                CREATE TABLE IF NOT EXISTS policy_state (
+                    name TEXT PRIMARY KEY,
+                    value REAL NOT NULL
+                );
+
+                -- Running total of size_bytes so size checks don't scan the table
+                CREATE TABLE IF NOT EXISTS cache_meta (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    total_bytes INTEGER NOT NULL DEFAULT 0
+                );
+                INSERT OR IGNORE INTO cache_meta (id, total_bytes)
+                    SELECT 1, COALESCE(SUM(size_bytes), 0) FROM cache_entries;
+                CREATE TRIGGER IF NOT EXISTS cache_entries_size_insert
+                    AFTER INSERT ON cache_entries BEGIN
+                        UPDATE cache_meta SET total_bytes = total_bytes + NEW.size_bytes
+                        WHERE id = 1;
+                    END;
+                -- Also fires for rows replaced by INSERT OR REPLACE (recursive_triggers)
+                CREATE TRIGGER IF NOT EXISTS cache_entries_size_delete
+                    AFTER DELETE ON cache_entries BEGIN
+                        UPDATE cache_meta SET total_bytes = total_bytes - OLD.size_bytes
+                        WHERE id = 1;
+                    END;
             """)
+            self._migrate_text_timestamps(conn)
 
-    @contextmanager
-    def get_connection(self) -> sqlite3.Connection:
-        """Get a SQLite connection for the current thread.
+    def _migrate_text_timestamps(self, conn: sqlite3.Connection):
+        """Rebuild tables created with ISO-8601 TEXT timestamps.
 
-        Returns:
-            A thread-local SQLite connection
+        TEXT affinity would turn the epoch integers back into strings, so the
+        rows are copied into tables with INTEGER columns and converted.
         """
-        thread_id = threading.get_ident()
 
-        with self._lock:
-            if thread_id not in self._connection_pool:
-                # Create new connection
-                conn = sqlite3.connect(
-                    str(self.db_path), detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
+        def column_type(table: str, column: str) -> str | None:
+            columns = {
+                row["name"]: row["type"] for row in conn.execute(f"PRAGMA table_info({table})")
+            }
+            return columns.get(column)
+
+        def to_ms(value: str | None) -> int | None:
+            return _to_epoch_ms(datetime.fromisoformat(value)) if value else None
+
+        if column_type("cache_ghosts", "evicted_at") == "TEXT":
+            ghosts = conn.execute("SELECT key, list, evicted_at FROM cache_ghosts").fetchall()
+            with conn:
+                conn.execute("DROP TABLE cache_ghosts")
+            self._init_db()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO cache_ghosts (key, list, evicted_at) VALUES (?, ?, ?)",
+                    [(row["key"], row["list"], to_ms(row["evicted_at"])) for row in ghosts],
                 )
-                # Important: Set row_factory to use dictionary access
-                conn.row_factory = sqlite3.Row
 
-                # Enable foreign keys
-                conn.execute("PRAGMA foreign_keys = ON")
+        if column_type("cache_entries", "expires_at") != "TEXT":
+            return
+
+        rows = conn.execute(
+            """
+            SELECT key, data, endpoint, created_at, expires_at,
+                   access_count, last_accessed, size_bytes
+            FROM cache_entries
+            """
+        ).fetchall()
+        with conn:
+            # Delete first so the size triggers take the old rows off the total
+            conn.execute("DELETE FROM cache_entries")
+            conn.execute("DROP TABLE cache_entries")
+        self._init_db()
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO cache_entries
+                    (key, data, endpoint, created_at, expires_at,
+                     access_count, last_accessed, size_bytes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        row["key"],
+                        row["data"],
+                        row["endpoint"],
+                        to_ms(row["created_at"]),
+                        to_ms(row["expires_at"]),
+                        row["access_count"],
+                        to_ms(row["last_accessed"]),
+                        row["size_bytes"],
+                    )
+                    for row in rows
+                ],
+            )
+        logger.info(f"Converted {len(rows)} cache entries to epoch timestamps")
 
-                # Use WAL mode for better concurrency
-                conn.execute("PRAGMA journal_mode = WAL")
+    @contextmanager
+    def get_connection(self, read_only: bool = False) -> sqlite3.Connection:
+        """Get a SQLite connection for the current thread.
 
-                # Set busy timeout
-                conn.execute("PRAGMA busy_timeout = 5000")
+        Args:
+            read_only: Use the thread's read-only connection, which under WAL
+                reads a snapshot without ever contending for the write lock
 
-                self._connection_pool[thread_id] = conn
+        Returns:
+            A thread-local SQLite connection
+        """
+        attr = "ro_conn" if read_only else "conn"
+        conn = getattr(self._local, attr, None)
+        if conn is None:
+            # Create new connection; only this thread uses it, but close() may
+            # run elsewhere, hence check_same_thread=False
+            target = f"{self.db_path.as_uri()}?mode=ro" if read_only else str(self.db_path)
+            conn = sqlite3.connect(
+                target,
+                detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+                cached_statements=self.STATEMENT_CACHE_SIZE,
+                check_same_thread=False,
+                uri=read_only,
+            )
+            # Important: Set row_factory to use dictionary access
+            conn.row_factory = sqlite3.Row
+
+            # Pragmas are per connection (journal_mode also persists in the
+            # file), so apply the whole set once when the thread connects
+            conn.executescript(self._PRAGMAS)
+
+            setattr(self._local, attr, conn)
+            with self._lock:
+                self._connections.append(conn)
 
-            try:
-                yield self._connection_pool[thread_id]
-            except sqlite3.Error as e:
-                logger.error(f"SQLite error: {e}")
-                raise
+        try:
+            yield conn
+        except sqlite3.Error as e:
+            logger.error(f"SQLite error: {e}")
+            raise
 
     def store(self, key: str, data: Any, endpoint: str, expires_at: datetime) -> bool:
         """Store data in the cache.
@@ -120,38 +423,75 @@ class SimpleStorage:
         # Check if we need to clean up the cache first
         self._check_cache_size()
         try:
-            # Handle pandas DataFrame
-            if isinstance(data, pd.DataFrame):
-                # Store DataFrame with metadata flag
-                serialized = json.dumps({"__pd_dataframe__": True, "data": data.to_json()})
-            else:
-                # Regular JSON serialization
-                serialized = json.dumps(data)
+            # DataFrames become columnar Arrow IPC bytes, everything else JSON text
+            serialized = _serialize(data)
 
             with self.get_connection() as conn:
-                conn.execute(
-                    """
-                    INSERT OR REPLACE INTO cache_entries
-                        (key, data, endpoint, created_at, expires_at, size_bytes)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """,
+                with conn:
+                    # Take the write lock up front; upgrading a read transaction
+                    # can fail with SQLITE_BUSY without waiting on busy_timeout
+                    conn.execute("BEGIN IMMEDIATE")
+                    self._adapt_to_ghost_hits(conn, [key])
+                    # Hits on the entry being replaced must not carry over
+                    with self._lock:
+                        self._pending_access.pop(key, None)
+                    conn.execute(
+                        self._SQL_INSERT,
+                        (
+                            key,
+                            serialized,
+                            endpoint,
+                            _now_ms(),
+                            _to_epoch_ms(expires_at),
+                            len(serialized),
+                        ),
+                    )
+                return True
+
+        except Exception as e:
+            logger.error(f"Error storing cache entry: {e}")
+            return False
+
+    def store_many(self, entries: list[tuple[str, Any, str, datetime]]) -> bool:
+        """Store several entries in a single transaction.
+
+        Args:
+            entries: List of (key, data, endpoint, expires_at) tuples
+
+        Returns:
+            True if storage successful, False otherwise
+        """
+        # Check if we need to clean up the cache first
+        self._check_cache_size()
+        try:
+            created_at = _now_ms()
+            rows = []
+            for key, data, endpoint, expires_at in entries:
+                serialized = _serialize(data)
+                rows.append(
                     (
                         key,
                         serialized,
                         endpoint,
-                        datetime.now().isoformat(),
-                        expires_at.isoformat(),
+                        created_at,
+                        _to_epoch_ms(expires_at),
                         len(serialized),
-                    ),
+                    )
                 )
 
-                conn.commit()
-                # Ensure changes are visible to other connections
-                conn.execute("PRAGMA wal_checkpoint(PASSIVE);")
+            with self.get_connection() as conn:
+                # One transaction for the whole batch instead of a commit per entry
+                with conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    self._adapt_to_ghost_hits(conn, [row[0] for row in rows])
+                    with self._lock:
+                        for row in rows:
+                            self._pending_access.pop(row[0], None)
+                    conn.executemany(self._SQL_INSERT, rows)
                 return True
 
         except Exception as e:
-            logger.error(f"Error storing cache entry: {e}")
+            logger.error(f"Error storing cache entries: {e}")
             return False
 
     def retrieve(self, key: str) -> tuple[Any | None, dict | None]:
@@ -164,87 +504,51 @@ class SimpleStorage:
             Tuple of (data, metadata) if found, (None, None) if not found
         """
         try:
-            with self.get_connection() as conn:
-                # First check if the key exists and if it's expired (optimization)
-                cursor = conn.execute(
-                    """
-                    SELECT expires_at FROM cache_entries 
-                    WHERE key = ? LIMIT 1
-                """,
-                    (key,),
-                )
-
-                expiry_row = cursor.fetchone()
-                if expiry_row is None:
+            with self.get_connection(read_only=True) as conn:
+                # One lookup for expiry, payload and metadata
+                row = conn.execute(self._SQL_SELECT, (key,)).fetchone()
+                if row is None:
                     return None, None
 
                 # Check expiration
-                try:
-                    expires_at = datetime.fromisoformat(expiry_row["expires_at"])
-                    now = datetime.now()
-
-                    # Ensure consistent timezone handling
-                    # If expires_at has timezone info but now doesn't
-                    if expires_at.tzinfo is not None and now.tzinfo is None:
-                        now = now.replace(tzinfo=expires_at.tzinfo)
-                    # If now has timezone info but expires_at doesn't
-                    elif now.tzinfo is not None and expires_at.tzinfo is None:
-                        expires_at = expires_at.replace(tzinfo=now.tzinfo)
-
-                    if expires_at < now:
-                        # Expired entry - delete it
-                        self.delete(key)
-                        return None, None
-                except (ValueError, TypeError) as e:
-                    logger.error(f"Error parsing expiration date: {e}")
-                    return None, None
-
-                # Now get the full data since we know it's valid
-                cursor = conn.execute(
-                    """
-                    SELECT data, endpoint, created_at, expires_at,
-                           access_count, last_accessed, size_bytes
-                    FROM cache_entries WHERE key = ?
-                """,
-                    (key,),
-                )
-
-                # Fetch the row
-                row = cursor.fetchone()
-                if not row:
+                now_ms = _now_ms()
+                if row["expires_at"] < now_ms:
+                    # Expired entry - delete it through the writable connection
+                    self.delete(key)
                     return None, None
 
                 # Extract data
                 try:
                     data_str = row["data"]
                     endpoint = row["endpoint"]
-                    created_at_str = row["created_at"]
-                    expires_at_str = row["expires_at"]
+                    created_at_ms = row["created_at"]
+                    expires_at_ms = row["expires_at"]
                     access_count = row["access_count"] or 0
-                    last_accessed_str = row["last_accessed"]
+                    last_accessed_ms = row["last_accessed"]
                 except (KeyError, IndexError) as e:
                     logger.error(f"Error accessing row data: {e}, row keys: {list(row.keys())}")
                     return None, None
 
-                # Update access statistics
-                now = datetime.now()
-                access_count += 1
-                conn.execute(
-                    """
-                    UPDATE cache_entries 
-                    SET access_count = ?, last_accessed = ?
-                    WHERE key = ?
-                """,
-                    (access_count, now.isoformat(), key),
-                )
-                conn.commit()
+                # Record the hit; the UPDATE is deferred to a batched flush
+                with self._lock:
+                    pending_hits, _ = self._pending_access.get(key, (0, 0))
+                    self._pending_access[key] = (pending_hits + 1, now_ms)
+                access_count += pending_hits + 1
+                self._maybe_flush_access()
 
                 # Deserialize data
                 try:
-                    # Parse JSON data
-                    parsed = json.loads(data_str)
+                    if isinstance(data_str, bytes) and data_str[:1] == ARROW_TAG:
+                        # Arrow-encoded DataFrame
+                        parsed = _arrow_to_dataframe(data_str)
+                    elif isinstance(data_str, bytes) and data_str[:1] == PICKLE_TAG:
+                        # Pickled value that JSON could not represent
+                        parsed = _unpickle_with_buffers(data_str)
+                    else:
+                        # Parse JSON data
+                        parsed = _deserialize_json(data_str)
 
-                    # Check if this is a DataFrame
+                    # Check if this is a legacy JSON-encoded DataFrame
                     if isinstance(parsed, dict) and parsed.get("__pd_dataframe__"):
                         # It's a DataFrame - use StringIO to avoid the warning
                         df_data = parsed["data"]
@@ -257,26 +561,13 @@ class SimpleStorage:
                     logger.error(f"Error deserializing data: {e}")
                     return None, None
 
-                # Parse datetime strings
-                try:
-                    created_dt = datetime.fromisoformat(created_at_str) if created_at_str else None
-                    expires_dt = datetime.fromisoformat(expires_at_str) if expires_at_str else None
-                    last_accessed_dt = (
-                        datetime.fromisoformat(last_accessed_str) if last_accessed_str else None
-                    )
-                except (ValueError, TypeError) as e:
-                    logger.warning(f"Error parsing datetime: {e}")
-                    created_dt = None
-                    expires_dt = None
-                    last_accessed_dt = None
-
                 # Build metadata
                 metadata = {
                     "endpoint": endpoint,
-                    "created_at": created_dt,
-                    "expires_at": expires_dt,
+                    "created_at": _from_epoch_ms(created_at_ms),
+                    "expires_at": _from_epoch_ms(expires_at_ms),
                     "access_count": access_count,
-                    "last_accessed": last_accessed_dt,
+                    "last_accessed": _from_epoch_ms(last_accessed_ms),
                 }
 
                 return deserialized, metadata
@@ -296,8 +587,10 @@ class SimpleStorage:
         """
         try:
             with self.get_connection() as conn:
-                conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                conn.execute(self._SQL_DELETE, (key,))
                 conn.commit()
+                with self._lock:
+                    self._pending_access.pop(key, None)
                 return True
         except Exception as e:
             logger.error(f"Error deleting cache entry: {e}")
@@ -313,6 +606,8 @@ class SimpleStorage:
             with self.get_connection() as conn:
                 conn.execute("DELETE FROM cache_entries")
                 conn.commit()
+                with self._lock:
+                    self._pending_access.clear()
                 return True
         except Exception as e:
             logger.error(f"Error clearing cache: {e}")
@@ -334,7 +629,7 @@ class SimpleStorage:
                     DELETE FROM cache_entries
                     WHERE expires_at < ?
                 """,
-                    (before.isoformat(),),
+                    (_to_epoch_ms(before),),
                 )
                 conn.commit()
                 return cursor.rowcount
@@ -368,12 +663,12 @@ class SimpleStorage:
 
     def _check_cache_size(self):
         """Check if the cache size exceeds the maximum and clean up if necessary."""
+        # Eviction ranks on access stats, so they must be current
+        self._flush_access()
         try:
             with self.get_connection() as conn:
                 # First check the current cache size
-                cursor = conn.execute("""
-                    SELECT SUM(size_bytes) FROM cache_entries
-                """)
+                cursor = conn.execute(self._SQL_TOTAL_BYTES)
                 row = cursor.fetchone()
                 if row and row[0]:
                     current_size_bytes = row[0]
@@ -387,54 +682,106 @@ class SimpleStorage:
                             f"({max_size_bytes / 1024 / 1024:.2f}MB). Cleaning up..."
                         )
 
-                        # Delete oldest entries first, based on last_accessed
-                        # Calculate how much we need to remove
-                        excess_bytes = current_size_bytes - (
-                            max_size_bytes * 0.8
-                        )  # Remove enough to get to 80% of max
-
-                        # Get the oldest entries up to the excess amount
-                        cursor = conn.execute("""
-                            SELECT key, size_bytes FROM cache_entries
-                            ORDER BY last_accessed ASC
-                        """)
-
-                        entries_to_delete = []
-                        bytes_to_delete = 0
-
-                        for row in cursor:
-                            entries_to_delete.append(row[0])
-                            bytes_to_delete += row[1]
-                            if bytes_to_delete >= excess_bytes:
-                                break
-
-                        # Delete the entries
-                        if entries_to_delete:
-                            placeholders = ", ".join(["?" for _ in entries_to_delete])
-                            conn.execute(
-                                f"""
-                                DELETE FROM cache_entries
-                                WHERE key IN ({placeholders})
-                            """,
-                                entries_to_delete,
-                            )
-                            conn.commit()
-
+                        # Remove enough to get to 80% of max, coldest entries first
+                        target_bytes = max_size_bytes * 0.8
+                        evicted_at = _now_ms()
+                        (count,) = conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()
+                        avg_size = current_size_bytes / max(count, 1)
+                        evicted = 0
+
+                        with conn:
+                            conn.execute("BEGIN IMMEDIATE")
+                            # Re-read under the write lock; another writer may have evicted
+                            remaining_bytes = conn.execute(self._SQL_TOTAL_BYTES).fetchone()[0]
+                            # Size each batch from the average entry; cold entries may
+                            # be smaller than average, so repeat until under target
+                            while remaining_bytes > target_bytes:
+                                limit = math.ceil((remaining_bytes - target_bytes) / avg_size)
+                                conn.execute(
+                                    self._SQL_GHOST_COLDEST,
+                                    (
+                                        self.GHOST_FREQUENT,
+                                        self.GHOST_RECENT,
+                                        evicted_at,
+                                        self._alpha,
+                                        self._alpha,
+                                        limit,
+                                    ),
+                                )
+                                deleted = conn.execute(
+                                    self._SQL_DELETE_GHOSTED, (evicted_at,)
+                                ).rowcount
+                                if not deleted:
+                                    break
+                                evicted += deleted
+                                remaining_bytes = conn.execute(self._SQL_TOTAL_BYTES).fetchone()[0]
+                            conn.execute(self._SQL_TRIM_GHOSTS, (self.MAX_GHOSTS,))
+
+                        if evicted:
                             logger.info(
-                                f"Removed {len(entries_to_delete)} entries "
-                                f"({bytes_to_delete / 1024 / 1024:.2f}MB) from cache"
+                                f"Removed {evicted} entries "
+                                f"({(current_size_bytes - remaining_bytes) / 1024 / 1024:.2f}MB) "
+                                "from cache"
                             )
         except Exception as e:
             logger.error(f"Error checking cache size: {e}")
 
+    def _maybe_flush_access(self):
+        """Flush pending access stats once enough hits or time have accumulated."""
+        if (
+            len(self._pending_access) >= self.ACCESS_FLUSH_THRESHOLD
+            or time.monotonic() - self._last_access_flush >= self.ACCESS_FLUSH_INTERVAL_SECONDS
+        ):
+            self._flush_access()
+
+    def _flush_access(self):
+        """Write pending access counts and times in one transaction."""
+        with self._lock:
+            self._last_access_flush = time.monotonic()
+            if not self._pending_access:
+                return
+            pending, self._pending_access = self._pending_access, {}
+        rows = [(hits, last_accessed, key) for key, (hits, last_accessed) in pending.items()]
+        try:
+            with self.get_connection() as conn:
+                with conn:
+                    conn.executemany(self._SQL_UPDATE_ACCESS, rows)
+        except Exception as e:
+            logger.error(f"Error updating access statistics: {e}")
+
+    def _adapt_to_ghost_hits(self, conn: sqlite3.Connection, keys: list[str]):
+        """Shift the eviction weight when recently evicted keys are stored again.
+
+        A returning key that had been reused before eviction means frequency
+        deserved more weight; one evicted cold means recency did.
+        """
+        # Bind the keys as one JSON array so the statement text never changes
+        rows = conn.execute(self._SQL_SELECT_GHOSTS, (orjson.dumps(keys),)).fetchall()
+        if not rows:
+            return
+
+        alpha = self._alpha
+        for row in rows:
+            if row[1] == self.GHOST_FREQUENT:
+                alpha += self.ALPHA_STEP
+            else:
+                alpha -= self.ALPHA_STEP
+        self._alpha = min(1.0, max(0.0, alpha))
+
+        conn.executemany(self._SQL_DELETE_GHOST, [(row[0],) for row in rows])
+        conn.execute(self._SQL_SAVE_ALPHA, (self._alpha,))
+
     def close(self):
         """Close all database connections."""
+        self._flush_access()
         with self._lock:
-            for conn in self._connection_pool.values():
+            for conn in self._connections:
                 # Commit any pending transactions
                 try:
                     conn.commit()
                 except sqlite3.Error:
                     pass
                 conn.close()
-            self._connection_pool.clear()
+            self._connections.clear()
+            # Drop every thread's cached handle so later calls reconnect
+            self._local = threading.local()
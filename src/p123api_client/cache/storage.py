@@ -1,18 +1,143 @@
 """SQLite storage backend for caching."""
 
 import base64
+import io
 import json
 import logging
 import pickle
 import sqlite3
+import struct
 import threading
+from collections.abc import Callable
 from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+import pandas as pd
+import zstandard
+
 logger = logging.getLogger(__name__)
 
+# Feather (Arrow IPC file) payloads start with this magic, so they need no extra tag
+FEATHER_MAGIC = b"ARROW1"
+PICKLE_PROTO = pickle.PROTO
+# Pickle with out-of-band buffers: magic, buffer count, lengths, then the payloads
+PICKLE_OOB_MAGIC = b"P123OOB1"
+# Zstandard frames identify themselves the same way
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Pickle payloads at least this large are zstd-compressed before they're stored
+COMPRESS_MIN_BYTES = 1024
+ZSTD_LEVEL = 3
+
+# zstandard (de)compressors must not be shared between threads
+_zstd = threading.local()
+
+
+def _compress(payload: bytes) -> bytes:
+    """Compress a payload with this thread's zstd compressor."""
+    if not hasattr(_zstd, "compressor"):
+        _zstd.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    return _zstd.compressor.compress(payload)
+
+
+def _decompress(payload: bytes) -> bytes:
+    """Decompress a zstd frame with this thread's decompressor."""
+    if not hasattr(_zstd, "decompressor"):
+        _zstd.decompressor = zstandard.ZstdDecompressor()
+    return _zstd.decompressor.decompress(payload)
+
+
+def _pickle(data: Any) -> bytes:
+    """Pickle a value, compressing it when it's large enough to be worth it.
+
+    NumPy blocks are taken out-of-band (protocol 5) and appended as raw buffers
+    instead of being copied through the pickle stream.
+    """
+    buffers: list[pickle.PickleBuffer] = []
+    payload = pickle.dumps(data, protocol=5, buffer_callback=buffers.append)
+    if buffers:
+        parts = [payload, *(buffer.raw() for buffer in buffers)]
+        header = struct.pack(f"<I{len(parts)}Q", len(parts), *(len(part) for part in parts))
+        payload = b"".join([PICKLE_OOB_MAGIC, header, *parts])
+    return _compress(payload) if len(payload) >= COMPRESS_MIN_BYTES else payload
+
+
+def _unpickle(payload: bytes) -> Any:
+    """Load a value written by _pickle (after any decompression)."""
+    if payload[: len(PICKLE_OOB_MAGIC)] != PICKLE_OOB_MAGIC:
+        return pickle.loads(payload)
+
+    # Copy once into a writable buffer so the restored arrays aren't read-only
+    view = memoryview(bytearray(payload))
+    offset = len(PICKLE_OOB_MAGIC)
+    (count,) = struct.unpack_from("<I", view, offset)
+    offset += 4
+    lengths = struct.unpack_from(f"<{count}Q", view, offset)
+    offset += 8 * count
+    parts = []
+    for length in lengths:
+        parts.append(view[offset : offset + length])
+        offset += length
+    return pickle.loads(parts[0], buffers=parts[1:])
+
+
+def _dataframe_to_feather(df: pd.DataFrame) -> bytes | None:
+    """Serialize a DataFrame to Feather bytes, or None if Feather can't represent it."""
+    buffer = io.BytesIO()
+    try:
+        # Arrow compresses each column buffer itself, which keeps reads zero-copy
+        df.to_feather(buffer, compression="zstd", compression_level=ZSTD_LEVEL)
+    except (ValueError, TypeError) as e:
+        logger.debug(f"Feather serialization failed, falling back: {e}")
+        return None
+    return buffer.getvalue()
+
+
+class NegativeResult:
+    """Marker cached in place of a None result, since a None from the cache is a miss.
+
+    It is its own type so no API payload can be mistaken for it.
+    """
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "NEGATIVE_RESULT"
+
+
+def _json_default(o: Any) -> str:
+    """Stringify values JSON can't represent, except binary payloads and markers."""
+    if isinstance(o, (bytes, bytearray, memoryview, NegativeResult)):
+        # Stringifying would lose the value or its type, so let the pickle fallback keep it
+        raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+    return str(o)
+
+
+def _serialize(data: Any) -> str | bytes:
+    """Serialize a cache value.
+
+    DataFrames become Feather bytes (or a pickle if Arrow can't hold them),
+    JSON-compatible values JSON text, and anything else (including values holding
+    raw bytes) falls back to a pickle stored as a BLOB, zstd-compressed when large.
+    """
+    # DataFrames become columnar Feather bytes that keep dtypes and attrs
+    if isinstance(data, pd.DataFrame):
+        # Columns Arrow can't represent (e.g. mixed objects) keep the frame as a pickle
+        feather = _dataframe_to_feather(data)
+        return feather or _pickle(data)
+
+    # Serialize data as JSON text for better readability and inspection
+    try:
+        # Store as plain text string, not binary
+        return json.dumps(data, default=_json_default)
+    except TypeError as e:
+        # If JSON serialization fails (e.g., for complex objects), fall back to
+        # pickle; SQLite stores the bytes as a BLOB as-is
+        logger.debug(f"JSON serialization failed, falling back to pickle: {e}")
+        return _pickle(data)
+
 
 # Register adapters and converters for datetime objects
 def adapt_datetime(dt):
@@ -23,11 +148,11 @@ def adapt_datetime(dt):
 
 
 def convert_datetime(value):
-    """Convert SQLite timestamp to datetime."""
+    """Convert SQLite timestamp (stored in UTC) to a timezone-aware datetime."""
     if value is None:
         return None
     try:
-        return datetime.strptime(value.decode(), "%Y-%m-%d %H:%M:%S")
+        return datetime.fromisoformat(value.decode()).replace(tzinfo=timezone.utc)
     except ValueError as e:
         logger.error(f"Failed to convert timestamp: {e}")
         return None
@@ -41,18 +166,71 @@ sqlite3.register_converter("timestamp", convert_datetime)
 class SQLiteStorage:
     """SQLite-based storage backend for caching."""
 
-    def __init__(self, db_path: str, max_cache_size_mb: int = 100):
+    # Hot-path SQL kept as constant strings so sqlite3's statement cache reuses the plans
+    _SQL_INSERT = """
+        INSERT OR REPLACE INTO cache_entries
+            (key, data, endpoint, created_at, expires_at, size_bytes, params_blob)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+    _SQL_SELECT_EXPIRY = "SELECT expires_at FROM cache_entries WHERE key = ? LIMIT 1"
+    _SQL_SELECT = """
+        SELECT data, endpoint, created_at, expires_at,
+               access_count, last_accessed
+        FROM cache_entries WHERE key = ?
+    """
+    _SQL_TOUCH = """
+        UPDATE cache_entries
+        SET access_count = access_count + 1, last_accessed = ?
+        WHERE key = ?
+    """
+    _SQL_DELETE = "DELETE FROM cache_entries WHERE key = ?"
+    _SQL_TOTALS = "SELECT COUNT(*) as count, SUM(size_bytes) as size FROM cache_entries"
+    _SQL_LATEST_STATS = "SELECT hits, misses FROM cache_statistics ORDER BY timestamp DESC LIMIT 1"
+    _SQL_INSERT_STATS = """
+        INSERT OR REPLACE INTO cache_statistics
+            (timestamp, hits, misses, total_entries, total_size_bytes)
+        VALUES (?, ?, ?, ?, ?)
+    """
+
+    # Room for the hot statements above plus ad-hoc queries without evictions
+    STATEMENT_CACHE_SIZE = 512
+
+    def __init__(
+        self,
+        db_path: str,
+        max_cache_size_mb: int = 100,
+        synchronous: str = "NORMAL",
+        cache_size_kb: int = 64 * 1024,
+        mmap_size_mb: int = 256,
+        busy_timeout_ms: int = 5000,
+    ):
         """Initialize SQLite storage.
 
         Args:
             db_path: Path to SQLite database file
             max_cache_size_mb: Maximum cache size in megabytes
+            synchronous: SQLite synchronous mode (OFF, NORMAL, FULL or EXTRA)
+            cache_size_kb: Page cache size per connection in KiB
+            mmap_size_mb: Memory-mapped I/O size per connection in MiB (0 disables it)
+            busy_timeout_ms: How long to wait on a locked database in milliseconds
         """
         self.db_path = Path(db_path).expanduser().resolve()
         self._connection_pool = {}
         self._lock = threading.RLock()
+        self._bulk_threads: set[int] = set()
         self.max_cache_size_mb = max_cache_size_mb
 
+        # synchronous, cache_size and mmap_size are per-connection, so every new
+        # connection runs these
+        self._pragmas = (
+            "PRAGMA journal_mode = WAL",
+            f"PRAGMA synchronous = {synchronous.upper()}",
+            "PRAGMA temp_store = MEMORY",
+            f"PRAGMA cache_size = {-int(cache_size_kb)}",
+            f"PRAGMA mmap_size = {int(mmap_size_mb) * 1024 * 1024}",
+            f"PRAGMA busy_timeout = {int(busy_timeout_ms)}",
+        )
+
         # Ensure directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -66,13 +244,14 @@ class SQLiteStorage:
                 -- Cache entries table
                 CREATE TABLE IF NOT EXISTS cache_entries (
                     key TEXT PRIMARY KEY,
-                    data TEXT NOT NULL,  -- Using TEXT for better inspection
+                    data BLOB NOT NULL,  -- JSON text, or Feather bytes for DataFrames
                     endpoint TEXT NOT NULL,
                     created_at TIMESTAMP NOT NULL,
                     expires_at TIMESTAMP NOT NULL,
                     access_count INTEGER DEFAULT 0,
                     last_accessed TIMESTAMP,
-                    size_bytes INTEGER NOT NULL
+                    size_bytes INTEGER NOT NULL,
+                    params_blob BLOB  -- Canonical parameter JSON the key was hashed from
                 );
                 
                 -- Create indexes for efficient lookups
@@ -95,13 +274,14 @@ class SQLiteStorage:
                 -- Create index on timestamp for faster stats lookups
                 CREATE INDEX IF NOT EXISTS idx_stats_timestamp
                     ON cache_statistics(timestamp DESC);
-                
-                -- Add pragma optimizations
-                PRAGMA synchronous = NORMAL;  -- Faster writes with reasonable safety
-                PRAGMA journal_mode = WAL;    -- Better concurrency
-                PRAGMA cache_size = -2000;    -- Use 2MB of memory for cache
             """)
 
+            # Databases created before params were stored lack the column
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(cache_entries)")}
+            if "params_blob" not in columns:
+                conn.execute("ALTER TABLE cache_entries ADD COLUMN params_blob BLOB")
+                conn.commit()
+
     @contextmanager
     def get_connection(self) -> sqlite3.Connection:
         """Get a SQLite connection for the current thread.
@@ -115,7 +295,9 @@ class SQLiteStorage:
             if thread_id not in self._connection_pool:
                 # Create new connection
                 conn = sqlite3.connect(
-                    str(self.db_path), detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
+                    str(self.db_path),
+                    detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+                    cached_statements=self.STATEMENT_CACHE_SIZE,
                 )
                 # Ensure we can access rows by column name
                 conn.row_factory = sqlite3.Row
@@ -123,11 +305,9 @@ class SQLiteStorage:
                 # Enable foreign keys
                 conn.execute("PRAGMA foreign_keys = ON")
 
-                # Use WAL mode for better concurrency
-                conn.execute("PRAGMA journal_mode = WAL")
-
-                # Set busy timeout
-                conn.execute("PRAGMA busy_timeout = 5000")
+                # WAL for concurrency, plus synchronous/cache/mmap/busy timeout tuning
+                for pragma in self._pragmas:
+                    conn.execute(pragma)
 
                 self._connection_pool[thread_id] = conn
 
@@ -139,7 +319,58 @@ class SQLiteStorage:
                 logger.error(f"SQLite error: {e}")
                 raise
 
-    def store(self, key: str, data: Any, endpoint: str, expires_at: datetime) -> bool:
+    @contextmanager
+    def transaction(self):
+        """Run the cache operations in the block inside one write transaction.
+
+        Stores, access-count updates and statistics made on this thread are
+        committed together when the block exits, or rolled back on error.
+        Nested calls join the outer transaction.
+        """
+        thread_id = threading.get_ident()
+        if thread_id in self._bulk_threads:
+            yield
+            return
+
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+        self._bulk_threads.add(thread_id)
+        try:
+            yield
+        except BaseException:
+            self._bulk_threads.discard(thread_id)
+            with self.get_connection() as conn:
+                conn.rollback()
+            raise
+        self._bulk_threads.discard(thread_id)
+        with self.get_connection() as conn:
+            conn.commit()
+            # Ensure changes are visible to other connections
+            conn.execute("PRAGMA wal_checkpoint(FULL);")
+
+    def in_transaction(self) -> bool:
+        """Check whether a bulk transaction is open on the current thread."""
+        return threading.get_ident() in self._bulk_threads
+
+    def _commit(self, conn: sqlite3.Connection) -> bool:
+        """Commit unless a bulk transaction is open on this thread.
+
+        Returns:
+            True if the transaction was committed
+        """
+        if threading.get_ident() in self._bulk_threads:
+            return False
+        conn.commit()
+        return True
+
+    def store(
+        self,
+        key: str,
+        data: Any,
+        endpoint: str,
+        expires_at: datetime,
+        params_blob: bytes | None = None,
+    ) -> bool:
         """Store data in the cache.
 
         Args:
@@ -147,6 +378,7 @@ class SQLiteStorage:
             data: Data to store
             endpoint: API endpoint this data is for
             expires_at: When this cache entry expires
+            params_blob: Optional canonical parameter bytes the key was derived from
 
         Returns:
             True if storage successful, False otherwise
@@ -154,24 +386,11 @@ class SQLiteStorage:
         # Check if we need to clean up the cache first
         self._check_cache_size()
         try:
-            # Serialize data as JSON text for better readability and inspection
-            try:
-                # Store as plain text string, not binary
-                serialized = json.dumps(data, default=str)
-            except TypeError as e:
-                # If JSON serialization fails (e.g., for complex objects), fall back to pickle
-                # but encode it to a base64 string so it can be stored as text
-                logger.warning(f"JSON serialization failed, falling back to pickle: {e}")
-                pickle_data = pickle.dumps(data)
-                serialized = f"PICKLE:{base64.b64encode(pickle_data).decode('ascii')}"
+            serialized = _serialize(data)
 
             with self.get_connection() as conn:
                 conn.execute(
-                    """
-                    INSERT OR REPLACE INTO cache_entries
-                        (key, data, endpoint, created_at, expires_at, size_bytes)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """,
+                    self._SQL_INSERT,
                     (
                         key,
                         serialized,
@@ -183,17 +402,58 @@ class SQLiteStorage:
                             microsecond=0
                         ),  # Store as native datetime
                         len(serialized),
+                        params_blob,
                     ),
                 )
-                conn.commit()
-                # Ensure changes are visible to other connections
-                conn.execute("PRAGMA wal_checkpoint(FULL);")
+                if self._commit(conn):
+                    # Ensure changes are visible to other connections
+                    conn.execute("PRAGMA wal_checkpoint(FULL);")
                 return True
 
         except Exception as e:
             logger.error(f"Error storing cache entry: {e}")
             return False
 
+    def store_many(self, entries: list[tuple]) -> bool:
+        """Store several entries with one executemany in a single transaction.
+
+        Args:
+            entries: List of (key, data, endpoint, expires_at) or
+                (key, data, endpoint, expires_at, params_blob) tuples
+
+        Returns:
+            True if storage successful, False otherwise
+        """
+        # Check if we need to clean up the cache first
+        self._check_cache_size()
+        try:
+            created_at = datetime.now(timezone.utc).replace(microsecond=0)
+            rows = []
+            for key, data, endpoint, expires_at, *params_blob in entries:
+                serialized = _serialize(data)
+                rows.append(
+                    (
+                        key,
+                        serialized,
+                        endpoint,
+                        created_at,
+                        expires_at.astimezone(timezone.utc).replace(microsecond=0),
+                        len(serialized),
+                        params_blob[0] if params_blob else None,
+                    )
+                )
+
+            with self.get_connection() as conn:
+                conn.executemany(self._SQL_INSERT, rows)
+                if self._commit(conn):
+                    # Ensure changes are visible to other connections
+                    conn.execute("PRAGMA wal_checkpoint(FULL);")
+                return True
+
+        except Exception as e:
+            logger.error(f"Error storing cache entries: {e}")
+            return False
+
     def retrieve(self, key: str) -> tuple[Any | None, dict | None]:
         """Retrieve data from the cache.
 
@@ -209,56 +469,31 @@ class SQLiteStorage:
                 conn.row_factory = sqlite3.Row
 
                 # First check if the key exists and if it's expired
-                cursor = conn.execute(
-                    """
-                    SELECT expires_at FROM cache_entries 
-                    WHERE key = ? LIMIT 1
-                """,
-                    (key,),
-                )
+                cursor = conn.execute(self._SQL_SELECT_EXPIRY, (key,))
 
                 expiry_row = cursor.fetchone()
                 if expiry_row is None:
                     return None, None
 
-                # Check if expired
+                # Check if expired (timestamps are converted to aware UTC datetimes)
                 now = datetime.now(timezone.utc).replace(microsecond=0)
                 expires_at = expiry_row[0]
-
-                # Ensure both datetimes have timezone info
-                if expires_at and expires_at.tzinfo is None:
-                    expires_at = expires_at.replace(tzinfo=timezone.utc)
-
                 if expires_at and expires_at <= now:
                     # Delete expired entry
-                    conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
-                    conn.commit()
+                    conn.execute(self._SQL_DELETE, (key,))
+                    self._commit(conn)
                     return None, None
 
                 # Get the full data now that we know it's valid
-                cursor = conn.execute(
-                    """
-                    SELECT data, endpoint, created_at, expires_at,
-                           access_count, last_accessed
-                    FROM cache_entries WHERE key = ?
-                """,
-                    (key,),
-                )
+                cursor = conn.execute(self._SQL_SELECT, (key,))
 
                 row = cursor.fetchone()
                 if row is None:
                     return None, None
 
                 # Update access statistics
-                conn.execute(
-                    """
-                    UPDATE cache_entries 
-                    SET access_count = access_count + 1, last_accessed = ?
-                    WHERE key = ?
-                """,
-                    (now, key),
-                )
-                conn.commit()
+                conn.execute(self._SQL_TOUCH, (now, key))
+                self._commit(conn)
 
                 # Access row data by column name
                 try:
@@ -283,7 +518,7 @@ class SQLiteStorage:
 
                 # Deserialize data
                 try:
-                    # First check if it's a pickle-encoded string (for new format)
+                    # Base64 pickle strings written before pickles were stored as BLOBs
                     if isinstance(data_blob, str) and data_blob.startswith("PICKLE:"):
                         try:
                             pickle_data = base64.b64decode(data_blob[7:])  # Skip 'PICKLE:' prefix
@@ -298,6 +533,15 @@ class SQLiteStorage:
                         except Exception as e:
                             logger.error(f"Error deserializing JSON data: {e}")
                             deserialized = data_blob
+                    # Compressed pickle payload
+                    elif data_blob[:4] == ZSTD_MAGIC:
+                        deserialized = _unpickle(_decompress(data_blob))
+                    # Columnar DataFrame payload
+                    elif data_blob[:6] == FEATHER_MAGIC:
+                        deserialized = pd.read_feather(io.BytesIO(data_blob))
+                    # Pickle payload (protocol 2+ starts with the PROTO opcode)
+                    elif data_blob[:1] == PICKLE_PROTO or data_blob[:8] == PICKLE_OOB_MAGIC:
+                        deserialized = _unpickle(data_blob)
                     # For backward compatibility with old binary format
                     else:
                         try:
@@ -346,8 +590,8 @@ class SQLiteStorage:
         """
         try:
             with self.get_connection() as conn:
-                conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
-                conn.commit()
+                conn.execute(self._SQL_DELETE, (key,))
+                self._commit(conn)
                 return True
         except Exception as e:
             logger.error(f"Error deleting cache entry: {e}")
@@ -362,7 +606,7 @@ class SQLiteStorage:
         try:
             with self.get_connection() as conn:
                 conn.execute("DELETE FROM cache_entries")
-                conn.commit()
+                self._commit(conn)
                 return True
         except Exception as e:
             logger.error(f"Error clearing cache: {e}")
@@ -386,7 +630,7 @@ class SQLiteStorage:
                 """,
                     (before,),
                 )
-                conn.commit()
+                self._commit(conn)
                 return cursor.rowcount
         except Exception as e:
             logger.error(f"Error removing expired entries: {e}")
@@ -402,17 +646,11 @@ class SQLiteStorage:
         try:
             with self.get_connection() as conn:
                 # Get current totals
-                cursor = conn.execute("""
-                    SELECT COUNT(*) as count, SUM(size_bytes) as size
-                    FROM cache_entries
-                """)
+                cursor = conn.execute(self._SQL_TOTALS)
                 row = cursor.fetchone()
 
                 # Get latest statistics to update cumulative counts
-                latest_cursor = conn.execute("""
-                    SELECT hits, misses FROM cache_statistics
-                    ORDER BY timestamp DESC LIMIT 1
-                """)
+                latest_cursor = conn.execute(self._SQL_LATEST_STATS)
                 latest_row = latest_cursor.fetchone()
 
                 if latest_row:
@@ -422,11 +660,7 @@ class SQLiteStorage:
 
                 # Store statistics - use INSERT OR REPLACE to handle potential duplicates
                 conn.execute(
-                    """
-                    INSERT OR REPLACE INTO cache_statistics
-                        (timestamp, hits, misses, total_entries, total_size_bytes)
-                    VALUES (?, ?, ?, ?, ?)
-                """,
+                    self._SQL_INSERT_STATS,
                     (
                         # Use current time with second precision to avoid duplicates
                         datetime.now(timezone.utc).replace(microsecond=0),
@@ -436,7 +670,7 @@ class SQLiteStorage:
                         row["size"] or 0,
                     ),
                 )
-                conn.commit()
+                self._commit(conn)
 
         except Exception as e:
             logger.error(f"Error updating statistics: {e}")
@@ -494,7 +728,7 @@ class SQLiteStorage:
                             """,
                                 entries_to_delete,
                             )
-                            conn.commit()
+                            self._commit(conn)
 
                             logger.info(
                                 f"Removed {len(entries_to_delete)} entries "
@@ -531,7 +765,56 @@ class SQLiteStorage:
         try:
             with self.get_connection() as conn:
                 conn.execute("DELETE FROM cache_entries WHERE endpoint = ?", (endpoint,))
-                conn.commit()
+                self._commit(conn)
+                return True
+        except Exception as e:
+            logger.error(f"Error deleting cache entries for endpoint {endpoint}: {e}")
+            return False
+
+    def delete_by_params(self, endpoint: str, params_blob: bytes) -> bool:
+        """Delete the cache entries of an endpoint stored with exactly these params.
+
+        Args:
+            endpoint: The endpoint to delete entries for
+            params_blob: Canonical parameter bytes to match
+
+        Returns:
+            True if deletion successful, False otherwise
+        """
+        try:
+            with self.get_connection() as conn:
+                conn.execute(
+                    "DELETE FROM cache_entries WHERE endpoint = ? AND params_blob = ?",
+                    (endpoint, params_blob),
+                )
+                self._commit(conn)
+                return True
+        except Exception as e:
+            logger.error(f"Error deleting cache entries for endpoint {endpoint}: {e}")
+            return False
+
+    def delete_where_params(self, endpoint: str, predicate: Callable[[bytes], bool]) -> bool:
+        """Delete the cache entries of an endpoint whose stored params match a predicate.
+
+        Entries stored without params are never matched.
+
+        Args:
+            endpoint: The endpoint to delete entries for
+            predicate: Called with each entry's canonical parameter bytes
+
+        Returns:
+            True if deletion successful, False otherwise
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.execute(
+                    "SELECT key, params_blob FROM cache_entries "
+                    "WHERE endpoint = ? AND params_blob IS NOT NULL",
+                    (endpoint,),
+                )
+                keys = [(key,) for key, params_blob in cursor if predicate(params_blob)]
+                conn.executemany(self._SQL_DELETE, keys)
+                self._commit(conn)
                 return True
         except Exception as e:
             logger.error(f"Error deleting cache entries for endpoint {endpoint}: {e}")
@@ -5,6 +5,7 @@ from __future__ import annotations
 import os
 from typing import TypedDict
 
+import orjson
 import requests
 
 
@@ -66,11 +67,13 @@ class Client:
         """
         response = self.session.post(
             f"{self.base_url}/rank/update",
-            json={
-                "factorId": factor_id,
-                "universeId": universe_id,
-                "ascending": ascending,
-            },
+            data=orjson.dumps(
+                {
+                    "factorId": factor_id,
+                    "universeId": universe_id,
+                    "ascending": ascending,
+                }
+            ),
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
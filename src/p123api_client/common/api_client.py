@@ -7,6 +7,7 @@ import os
 import time
 from typing import Any, Generic, TypeVar, cast
 
+import orjson
 import requests
 from p123api import Client
 from pydantic import BaseModel
@@ -87,9 +88,8 @@ class APIClient(Generic[ResponseT]):
             api_method = getattr(self.client, method)
 
             # Log the exact parameters being sent to the API
-            import json
-
-            logging.info(f"API request to {method} with params: {json.dumps(params, default=str)}")
+            params_json = orjson.dumps(params, default=str, option=orjson.OPT_NON_STR_KEYS)
+            logging.info(f"API request to {method} with params: {params_json.decode()}")
 
             # Remove any 'factors' parameter that might be causing issues
             if method == "screen_backtest" and "factors" in params:
@@ -4,7 +4,8 @@ from .cached_screen_run_api import CachedScreenRunAPI
 from .schemas import ScreenDefinition, ScreenRunRequest, ScreenRunResponse
 from .screen_run_api import ScreenRunAPI
 
-# CachedScreenRunAPI is now the preferred name
+# CachedScreenRunAPI is now the preferred name; the old one is kept as an alias
+EnhancedScreenRunAPI = CachedScreenRunAPI
 
 __all__ = [
     "ScreenDefinition",
@@ -12,4 +13,5 @@ __all__ = [
     "ScreenRunResponse",
     "ScreenRunAPI",
     "CachedScreenRunAPI",
+    "EnhancedScreenRunAPI",
 ]
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import threading
 from datetime import date
 from typing import Any
 
@@ -143,7 +145,7 @@ class CachedScreenRunAPI(ScreenRunAPI):
             as_dataframe=as_dataframe,
         )
 
-    @cached_api_call("screen_run/simple")
+    @cached_api_call("screen_run/simple", write_through=True)
     def run_simple_screen(
         self, universe: str, formula: str, as_dataframe: bool = True, bypass_cache: bool = False
     ) -> ScreenRunResponse | pd.DataFrame:
@@ -155,7 +157,8 @@ class CachedScreenRunAPI(ScreenRunAPI):
             universe: Universe to screen (e.g., "SP500")
             formula: Single screen formula
             as_dataframe: Whether to return as DataFrame (default: True)
-            bypass_cache: Whether to bypass the cache (default: False)
+            bypass_cache: Whether to skip the cache lookup; the fresh result still
+                replaces the cached entry (default: False)
 
         Returns:
             Screen results as ScreenRunResponse or DataFrame
@@ -164,6 +167,69 @@ class CachedScreenRunAPI(ScreenRunAPI):
             universe=universe, rules=[formula], as_dataframe=as_dataframe, bypass_cache=bypass_cache
         )
 
+    async def async_run_simple_screen(
+        self, universe: str, formula: str, as_dataframe: bool = True, bypass_cache: bool = False
+    ) -> ScreenRunResponse | pd.DataFrame:
+        """Run a simple screen without blocking the event loop.
+
+        The cached lookup and API request run in a worker thread, so many screens
+        can be awaited concurrently with `asyncio.gather`.
+
+        Args:
+            universe: Universe to screen (e.g., "SP500")
+            formula: Single screen formula
+            as_dataframe: Whether to return as DataFrame (default: True)
+            bypass_cache: Whether to bypass the cache (default: False)
+
+        Returns:
+            Screen results as ScreenRunResponse or DataFrame
+        """
+        return await asyncio.to_thread(
+            self.run_simple_screen,
+            universe=universe,
+            formula=formula,
+            as_dataframe=as_dataframe,
+            bypass_cache=bypass_cache,
+        )
+
+    def start_background_refresh(
+        self, universe: str, formula: str, interval_s: float = 60, as_dataframe: bool = True
+    ) -> threading.Event:
+        """Keep a simple screen's cache entry warm from a background thread.
+
+        The screen is fetched immediately and then every `interval_s` seconds,
+        replacing the cached entry each time so foreground calls with the same
+        arguments are served from the cache.
+
+        Args:
+            universe: Universe to screen (e.g., "SP500")
+            formula: Single screen formula
+            interval_s: Seconds between refreshes (default: 60)
+            as_dataframe: Must match the foreground calls to share their cache key
+
+        Returns:
+            Event that stops the refresher when set
+        """
+        stop = threading.Event()
+
+        def refresh_loop() -> None:
+            while True:
+                try:
+                    self.run_simple_screen(
+                        universe=universe,
+                        formula=formula,
+                        as_dataframe=as_dataframe,
+                        refresh_cache=True,
+                    )
+                    self.logger.debug(f"Refreshed cached screen {universe}: {formula}")
+                except Exception as e:
+                    self.logger.warning(f"Background refresh failed: {e}")
+                if stop.wait(interval_s):
+                    break
+
+        threading.Thread(target=refresh_loop, name="screen-cache-refresh", daemon=True).start()
+        return stop
+
     def run_screen_by_id(
         self,
         screen_id: int,
@@ -233,10 +299,7 @@ class CachedScreenRunAPI(ScreenRunAPI):
                     # Convert to DataFrame if requested
                     if as_dataframe:
                         self.logger.debug("Converting cached response to DataFrame")
-                        df = pd.DataFrame(response.rows, columns=response.columns)
-                        df.attrs["cost"] = response.cost
-                        df.attrs["quota_remaining"] = response.quotaRemaining
-                        return df
+                        return response.to_dataframe()
 
                     return response
 
@@ -285,9 +348,6 @@ class CachedScreenRunAPI(ScreenRunAPI):
         # Convert to DataFrame if requested
         if as_dataframe and isinstance(response, ScreenRunResponse):
             self.logger.debug("Converting response to DataFrame")
-            df = pd.DataFrame(response.rows, columns=response.columns)
-            df.attrs["cost"] = response.cost
-            df.attrs["quota_remaining"] = response.quotaRemaining
-            return df
+            return response.to_dataframe()
 
         return response
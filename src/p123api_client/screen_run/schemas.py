@@ -6,6 +6,7 @@ from collections.abc import Callable, Generator
 from datetime import date
 from typing import Any
 
+import pandas as pd
 from pydantic import BaseModel, Field, field_validator
 
 from ..models.enums import (
@@ -124,6 +125,17 @@ class ScreenRunResponse(BaseModel):
     columns: list[str] = Field(default_factory=list, description="Column names")
     rows: list[list[Any]] = Field(default_factory=list, description="Data rows")
 
+    def to_dataframe(self) -> pd.DataFrame:
+        """Convert rows to a DataFrame with cost and quota stored in its attrs.
+
+        Rows are passed to pandas directly, which infers typed columns without
+        building per-row dicts or re-parsing JSON.
+        """
+        df = pd.DataFrame(self.rows, columns=self.columns)
+        df.attrs["cost"] = self.cost
+        df.attrs["quota_remaining"] = self.quotaRemaining
+        return df
+
     def to_dict_list(self) -> list[dict[str, Any]]:
         """Convert rows to a list of dictionaries using column names as keys."""
         return [
@@ -31,11 +31,7 @@ class ScreenRunAPI(APIClient[ScreenRunResponse]):
 
             # If dataframe requested, convert to pandas DataFrame
             if as_dataframe:
-                df = pd.DataFrame(response.rows, columns=response.columns)
-                # Store metadata in DataFrame attributes
-                df.attrs["cost"] = response.cost
-                df.attrs["quota_remaining"] = response.quotaRemaining
-                return df
+                return response.to_dataframe()
 
             return response
 
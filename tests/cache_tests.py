@@ -2,9 +2,13 @@
 
 import os
 import pickle
+import sqlite3
 import tempfile
+import uuid
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -12,6 +16,11 @@ from p123api_client.cache.simple_storage import SimpleStorage
 from p123api_client.cache.storage import SQLiteStorage
 
 
+@dataclass
+class _Point:
+    a: int
+
+
 class TestSimpleStorage:
     """Tests for the SimpleStorage implementation."""
 
@@ -121,6 +130,218 @@ class TestSimpleStorage:
         assert data2 is None
         assert data3 == {"data": 3}
 
+    def test_store_many(self, storage):
+        """Test storing a batch of entries in one call."""
+        expires_at = datetime.now() + timedelta(hours=1)
+        entries = [
+            ("key1", {"data": 1}, "endpoint1", expires_at),
+            ("key2", {"data": 2}, "endpoint1", expires_at),
+            ("key3", {"data": 3}, "endpoint2", expires_at),
+        ]
+
+        assert storage.store_many(entries) is True
+
+        for key, data, endpoint, _ in entries:
+            retrieved, metadata = storage.retrieve(key)
+            assert retrieved == data
+            assert metadata["endpoint"] == endpoint
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {"x": float("nan")},
+            {"x": float("inf")},
+            datetime(2024, 1, 1),
+            uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            _Point(3),
+            {"big": 2**70},
+            {1: "int key"},
+            ("a", "tuple"),
+        ],
+        ids=["nan", "inf", "datetime", "uuid", "dataclass", "bigint", "int-key", "tuple"],
+    )
+    def test_values_round_trip_exactly(self, storage, data):
+        """Test values JSON would silently alter come back unchanged."""
+        storage.store("exact", data, "round-trip", datetime.now() + timedelta(hours=1))
+        retrieved, _ = storage.retrieve("exact")
+
+        assert type(retrieved) is type(data)
+        if isinstance(data, dict) and "x" in data:
+            # NaN != NaN, so compare representations
+            assert repr(retrieved) == repr(data)
+        else:
+            assert retrieved == data
+
+    def test_non_json_values(self, storage):
+        """Test values JSON can't represent round-trip through the pickle fallback."""
+        data = {"tags": {"a", "b"}, "values": np.arange(10, dtype=np.float64)}
+        expires_at = datetime.now() + timedelta(hours=1)
+
+        assert storage.store("pickled", data, "pickle-test", expires_at) is True
+        retrieved, _ = storage.retrieve("pickled")
+
+        assert retrieved["tags"] == data["tags"]
+        np.testing.assert_array_equal(retrieved["values"], data["values"])
+        # Reconstructed arrays must be writeable
+        retrieved["values"][0] = 1.0
+
+    def test_access_stats_batched(self, storage):
+        """Test hits are counted immediately but written to SQLite in batches."""
+        storage.store("key", {"data": 1}, "endpoint", datetime.now() + timedelta(hours=1))
+        for expected in range(1, 4):
+            _, metadata = storage.retrieve("key")
+            assert metadata["access_count"] == expected
+
+        with storage.get_connection() as conn:
+            row = conn.execute("SELECT access_count FROM cache_entries WHERE key = 'key'")
+            assert row.fetchone()[0] == 0
+
+        storage._flush_access()
+        with storage.get_connection() as conn:
+            row = conn.execute("SELECT access_count, last_accessed FROM cache_entries")
+            access_count, last_accessed = row.fetchone()
+        assert access_count == 3
+        assert last_accessed is not None
+
+    def test_legacy_text_timestamps_migrated(self, tmp_path):
+        """Test a table with ISO-8601 TEXT timestamps is converted to epoch integers."""
+        db_path = str(tmp_path / "legacy.db")
+        now = datetime.now()
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""
+                CREATE TABLE cache_entries (
+                    key TEXT PRIMARY KEY, data TEXT NOT NULL, endpoint TEXT NOT NULL,
+                    created_at TEXT NOT NULL, expires_at TEXT NOT NULL,
+                    access_count INTEGER DEFAULT 0, last_accessed TEXT,
+                    size_bytes INTEGER NOT NULL
+                )
+            """)
+            conn.executemany(
+                "INSERT INTO cache_entries VALUES (?, ?, ?, ?, ?, 0, NULL, 8)",
+                [
+                    (
+                        "live",
+                        '{"a": 1}',
+                        "ep",
+                        now.isoformat(),
+                        (now + timedelta(hours=1)).isoformat(),
+                    ),
+                    (
+                        "stale",
+                        '{"a": 2}',
+                        "ep",
+                        now.isoformat(),
+                        (now - timedelta(hours=1)).isoformat(),
+                    ),
+                ],
+            )
+        conn.close()
+
+        storage = SimpleStorage(db_path)
+        try:
+            retrieved, metadata = storage.retrieve("live")
+            assert retrieved == {"a": 1}
+            expected = (now + timedelta(hours=1)).astimezone()
+            assert abs(metadata["expires_at"] - expected) < timedelta(milliseconds=1)
+            assert storage.retrieve("stale") == (None, None)
+            with storage.get_connection() as conn:
+                row = conn.execute(
+                    "SELECT typeof(created_at), typeof(expires_at) FROM cache_entries"
+                )
+                assert tuple(row.fetchone()) == ("integer", "integer")
+        finally:
+            storage.close()
+
+    def test_legacy_text_ghosts_migrated(self, tmp_path):
+        """Test ghost eviction times stored as ISO-8601 TEXT are converted to epoch integers."""
+        db_path = str(tmp_path / "legacy_ghosts.db")
+        evicted = datetime.now() - timedelta(minutes=5)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""
+                CREATE TABLE cache_ghosts (
+                    key TEXT PRIMARY KEY, list INTEGER NOT NULL, evicted_at TEXT NOT NULL
+                )
+            """)
+            conn.execute("INSERT INTO cache_ghosts VALUES ('gone', 1, ?)", (evicted.isoformat(),))
+        conn.close()
+
+        storage = SimpleStorage(db_path)
+        try:
+            with storage.get_connection() as conn:
+                key, evicted_at = conn.execute(
+                    "SELECT key, evicted_at FROM cache_ghosts"
+                ).fetchone()
+                column_type = next(
+                    row["type"]
+                    for row in conn.execute("PRAGMA table_info(cache_ghosts)")
+                    if row["name"] == "evicted_at"
+                )
+            assert key == "gone"
+            assert column_type == "INTEGER"
+            assert evicted_at == int(evicted.timestamp() * 1000)
+        finally:
+            storage.close()
+
+    def test_total_bytes_tracks_writes_and_deletes(self, storage):
+        """Test the running size total follows inserts, replacements and deletes."""
+
+        def total_bytes():
+            with storage.get_connection() as conn:
+                return conn.execute(storage._SQL_TOTAL_BYTES).fetchone()[0]
+
+        def table_bytes():
+            with storage.get_connection() as conn:
+                row = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM cache_entries")
+                return row.fetchone()[0]
+
+        expires_at = datetime.now() + timedelta(hours=1)
+        storage.store("a", {"data": "x" * 100}, "ep", expires_at)
+        storage.store_many([("b", [1, 2, 3], "ep", expires_at), ("c", "c", "other", expires_at)])
+        storage.store("a", {"data": "y"}, "ep", expires_at)
+        assert total_bytes() == table_bytes() > 0
+
+        storage.delete("b")
+        storage.clear_endpoint("other")
+        assert total_bytes() == table_bytes()
+
+        storage.clear()
+        assert total_bytes() == 0
+
+    def test_read_only_connection(self, storage):
+        """Test reads go through a separate connection that cannot write."""
+        storage.store("key", {"data": 1}, "endpoint", datetime.now() + timedelta(hours=1))
+
+        with storage.get_connection(read_only=True) as ro_conn:
+            with storage.get_connection() as rw_conn:
+                assert ro_conn is not rw_conn
+            assert ro_conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0] == 1
+            with pytest.raises(sqlite3.OperationalError):
+                ro_conn.execute("DELETE FROM cache_entries")
+
+        assert storage.retrieve("key")[0] == {"data": 1}
+
+    def test_size_eviction_keeps_reused_entries(self, tmp_path):
+        """Test size-based eviction drops cold entries and adapts on their return."""
+        storage = SimpleStorage(str(tmp_path / "evict.db"), max_cache_size_mb=1)
+        expires_at = datetime.now() + timedelta(hours=1)
+        try:
+            storage.store("hot", {"data": "hot"}, "screens", expires_at)
+            for _ in range(3):
+                storage.retrieve("hot")
+
+            # Each entry is ~400KB, so the fourth store pushes past the 1MB cap
+            for i in range(4):
+                storage.store(f"cold{i}", {"blob": "x" * 400_000}, "screens", expires_at)
+
+            assert storage.retrieve("hot")[0] == {"data": "hot"}
+            assert storage.retrieve("cold0") == (None, None)
+
+            # A cold entry coming back shifts the policy towards recency
+            storage.store("cold0", {"data": 0}, "screens", expires_at)
+            assert storage._alpha < 0.5
+        finally:
+            storage.close()
+
     def test_dataframe(self, storage):
         """Test storing and retrieving pandas DataFrame."""
         key = "dataframe"
@@ -140,12 +361,21 @@ class TestSimpleStorage:
         assert isinstance(retrieved, pd.DataFrame)
 
         # Verify all columns are present
-        assert set(retrieved.columns) == set(df.columns)
+        assert retrieved.columns.equals(df.columns)
 
         # Verify data values match
         for col in df.columns:
             assert retrieved[col].tolist() == df[col].tolist()
 
+    def test_dataframe_preserves_dtypes(self, storage):
+        """Test that DataFrames round-trip with their column dtypes intact."""
+        df = pd.DataFrame({"A": [1, 2, 3], "B": ["a", "b", "c"], "C": [1.1, 2.2, 3.3]})
+
+        storage.store("typed-df", df, "dataframe-test", datetime.now() + timedelta(hours=1))
+        retrieved, _ = storage.retrieve("typed-df")
+
+        pd.testing.assert_frame_equal(retrieved, df)
+
 
 # Core tests we want to keep for the SQLiteStorage class
 # to ensure it works with the main cache manager
@@ -197,6 +427,20 @@ class TestSQLiteStorage:
         assert retrieved is None
         assert metadata is None
 
+    def test_dataframe_stored_as_feather(self, storage):
+        """Test DataFrames are stored as Feather bytes with dtypes and attrs intact."""
+        df = pd.DataFrame({"ticker": ["AAPL", "MSFT"], "price": [190.5, 410.25], "rank": [1, 2]})
+        df.attrs["cost"] = 3
+        storage.store("df-key", df, "screen_run", datetime.now() + timedelta(hours=1))
+
+        with storage.get_connection() as conn:
+            raw = conn.execute("SELECT data FROM cache_entries WHERE key = ?", ("df-key",))
+            assert isinstance(raw.fetchone()[0], bytes)
+
+        retrieved, _ = storage.retrieve("df-key")
+        pd.testing.assert_frame_equal(retrieved, df)
+        assert retrieved.attrs["cost"] == 3
+
     def test_expired_entries(self, storage):
         """Test expired entries are removed correctly."""
         # Create timestamps for testing
@@ -4,10 +4,12 @@ This test file consolidates all screen run API tests into a single comprehensive
 covering basic functionality, parameter validation, caching, and integration tests.
 """
 
+import io
 import json
 import logging
 import os
 import sqlite3
+import sys
 import time
 from datetime import datetime
 from pathlib import Path
@@ -68,6 +70,22 @@ def print_section(title):
     print("=" * 80 + "\n")
 
 
+# Deltas below this are timer noise, so their timing lines are left out
+MIN_REPORTED_SECONDS = 1e-5
+
+
+def print_call_time(label, seconds):
+    """Print a call's execution time unless it is below MIN_REPORTED_SECONDS."""
+    if seconds >= MIN_REPORTED_SECONDS:
+        print(f"{label} execution time: {seconds * 1000:.3f} ms")
+
+
+def print_speedup(first_seconds, second_seconds):
+    """Print how much faster the second call was, if both timings are measurable."""
+    if min(first_seconds, second_seconds) >= MIN_REPORTED_SECONDS:
+        print(f"Speed improvement: {first_seconds / second_seconds:.1f}x faster")
+
+
 def print_result_summary(result):
     """Print a summary of the screen run result."""
     if not isinstance(result, pd.DataFrame):
@@ -78,16 +96,26 @@ def print_result_summary(result):
     cost = result.attrs.get("cost", "N/A")
     quota_remaining = result.attrs.get("quotaRemaining", "N/A")
 
-    # Print summary
-    print("Result summary:")
-    print(f"  - API quota cost: {cost}")
-    print(f"  - Quota remaining: {quota_remaining}")
-    print(f"  - Result rows: {len(result)}")
-    print(f"  - Result columns: {', '.join(result.columns[:5])}...")
+    # Assemble the summary and sample rows, then write them in one go
+    buf = io.StringIO()
+    buf.write("Result summary:\n")
+    buf.write(f"  - API quota cost: {cost}\n")
+    buf.write(f"  - Quota remaining: {quota_remaining}\n")
+    buf.write(f"  - Result rows: {len(result)}\n")
+    buf.write(f"  - Result columns: {', '.join(result.columns[:5])}...\n")
 
     # Print sample data
-    print("\nSample data:")
-    print(tabulate(result.head(5), headers="keys", tablefmt="grid"))
+    buf.write("\nSample data:\n")
+    head = result.iloc[:5]
+    head_rows = list(head.itertuples(index=False, name=None))
+    buf.write(
+        tabulate(
+            head_rows, headers=list(result.columns), tablefmt="grid", showindex=list(head.index)
+        )
+    )
+    buf.write("\n")
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
 
 
 def view_cache_database(db_path):
@@ -98,54 +126,75 @@ def view_cache_database(db_path):
         print(f"Cache database not found at {db_path}")
         return
 
-    print("\nCache entries:")
+    # Collect the report and write it once rather than a print per line
+    out = io.StringIO()
+    print("\nCache entries:", file=out)
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row  # Use row factory for named columns
+        # Open read-only so inspection never blocks or contends with the cache writer.
+        # journal_mode is left alone: the cache already runs in WAL and a read-only
+        # connection can't change it. Autocommit mode leaves transaction control to
+        # the explicit BEGIN below instead of the driver's implicit bracketing.
+        conn = sqlite3.connect(
+            f"{db_path.resolve().as_uri()}?mode=ro",
+            uri=True,
+            isolation_level=None,
+            timeout=5.0,
+            cached_statements=512,
+        )
+        conn.executescript(
+            "PRAGMA synchronous=NORMAL; PRAGMA temp_store=MEMORY; PRAGMA cache_size=-20000; "
+            "PRAGMA busy_timeout=5000; PRAGMA mmap_size=268435456;"
+        )
         cursor = conn.cursor()
 
-        # Get cache entries
-        cursor.execute("""
-            SELECT key, endpoint, created_at, expires_at, access_count, size_bytes
-            FROM cache_entries
-            ORDER BY created_at DESC
-        """)
-        rows = cursor.fetchall()
-
-        if rows:
-            # Create DataFrame with proper column names
-            df = pd.DataFrame(
-                rows,
-                columns=[
-                    "key",
-                    "endpoint",
-                    "created_at",
-                    "expires_at",
-                    "access_count",
-                    "size_bytes",
-                ],
+        # Read entries, totals and statistics from a single snapshot. A read-only
+        # connection can't BEGIN IMMEDIATE, but a deferred BEGIN pins the snapshot
+        # at the first SELECT for the rest of the transaction.
+        conn.execute("BEGIN")
+
+        # Get cache entries as plain tuples; tabulate reads them with the column names
+        # as headers, so no per-row dict is built
+        entry_columns = (
+            "key",
+            "endpoint",
+            "created_at",
+            "expires_at",
+            "access_count",
+            "size_bytes",
+        )
+        cursor.execute(
+            f"SELECT {', '.join(entry_columns)} FROM cache_entries ORDER BY created_at DESC"
+        )
+        entries = cursor.fetchall()
+
+        if entries:
+            print(
+                tabulate(entries, headers=entry_columns, tablefmt="grid", showindex=True), file=out
             )
-            print(tabulate(df, headers="keys", tablefmt="grid", showindex=True))
 
             # Calculate total size
-            total_size = sum(entry[5] for entry in rows)
-            print(f"\nTotal cache size: {total_size / 1024:.2f} KB")
-            print(f"Total entries: {len(rows)}")
+            total_size = sum(entry[-1] or 0 for entry in entries)
+            print(f"\nTotal cache size: {total_size / 1024:.2f} KB", file=out)
+            print(f"Total entries: {len(entries)}", file=out)
 
             # Show cache data for inspection
-            print("\nCache data samples:")
-            for i, row in enumerate(rows[:2]):  # Show first 2 entries
-                cursor.execute("SELECT data FROM cache_entries WHERE key = ?", (row[0],))
+            print("\nCache data samples:", file=out)
+            for i, entry in enumerate(entries[:2]):  # Show first 2 entries
+                key = entry[0]
+                cursor.execute("SELECT data FROM cache_entries WHERE key = ?", (key,))
                 data_row = cursor.fetchone()
                 if data_row:
                     data_blob = data_row[0]
-                    print(f"\nEntry {i + 1} data:")
+                    print(f"\nEntry {i + 1} data:", file=out)
 
                     # Try to parse as JSON first
                     try:
                         if isinstance(data_blob, str):
                             if data_blob.startswith("PICKLE:"):
-                                print("  [Base64 encoded pickle data - too large to display]")
+                                print(
+                                    "  [Base64 encoded pickle data - too large to display]",
+                                    file=out,
+                                )
                             else:
                                 # Parse as JSON
                                 json_data = json.loads(data_blob)
@@ -154,30 +203,37 @@ def view_cache_database(db_path):
                                     and "columns" in json_data
                                     and "rows" in json_data
                                 ):
-                                    print(f"  Columns: {json_data.get('columns', [])[:5]}...")
-                                    print(f"  Rows: {len(json_data.get('rows', []))} items")
+                                    sample_columns = json_data.get("columns", [])
+                                    sample_rows = json_data.get("rows", [])
+                                    print(f"  Columns: {sample_columns[:5]}...", file=out)
+                                    print(f"  Rows: {len(sample_rows)} items", file=out)
                                 else:
-                                    print(f"  Data: {json.dumps(json_data, indent=2)[:200]}...")
+                                    preview = json.dumps(json_data, indent=2)[:200]
+                                    print(f"  Data: {preview}...", file=out)
                         else:
-                            print(f"  Binary data: {len(data_blob)} bytes")
+                            print(f"  Binary data: {len(data_blob)} bytes", file=out)
                     except Exception as e:
-                        print(f"  Error parsing data: {e}")
+                        print(f"  Error parsing data: {e}", file=out)
         else:
-            print("No cache entries found.")
+            print("No cache entries found.", file=out)
 
         # Get cache statistics
         cursor.execute("SELECT * FROM cache_statistics ORDER BY timestamp DESC LIMIT 1")
         stats = cursor.fetchone()
 
         if stats:
-            print("\nCache statistics:")
+            print("\nCache statistics:", file=out)
             columns = [desc[0] for desc in cursor.description]
             for i, col in enumerate(columns):
-                print(f"  - {col}: {stats[i]}")
+                print(f"  - {col}: {stats[i]}", file=out)
 
+        conn.rollback()
         conn.close()
     except sqlite3.Error as e:
-        print(f"Error accessing cache database: {e}")
+        print(f"Error accessing cache database: {e}", file=out)
+
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
 
 
 # Fixtures
@@ -722,25 +778,25 @@ class TestCachedScreenRunAPI:
         print(f"Running screen with formula: {formula}")
 
         # First call - should make an API request
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         result1 = enhanced_api.run_simple_screen(
             universe="SP500", formula=formula, as_dataframe=True
         )
-        first_call_time = time.time() - start_time
+        first_call_time = (time.perf_counter_ns() - start_time) / 1e9
 
         print_result_summary(result1)
-        print(f"First call execution time: {first_call_time:.2f} seconds")
+        print_call_time("First call", first_call_time)
 
         # Second call - should use cache
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         result2 = enhanced_api.run_simple_screen(
             universe="SP500", formula=formula, as_dataframe=True
         )
-        second_call_time = time.time() - start_time
+        second_call_time = (time.perf_counter_ns() - start_time) / 1e9
 
         print_result_summary(result2)
-        print(f"Second call execution time: {second_call_time:.2f} seconds")
-        print(f"Speed improvement: {first_call_time / max(second_call_time, 0.001):.1f}x faster")
+        print_call_time("Second call", second_call_time)
+        print_speedup(first_call_time, second_call_time)
 
         # Verify results have the same structure
         assert isinstance(result1, pd.DataFrame), "First result should be a DataFrame"
@@ -748,7 +804,7 @@ class TestCachedScreenRunAPI:
         assert result1.shape == result2.shape, (
             "Cached result should have same shape as original result"
         )
-        assert set(result1.columns) == set(result2.columns), (
+        assert result1.columns.equals(result2.columns), (
             "Cached result should have same columns as original result"
         )
 
@@ -827,27 +883,34 @@ def test_visual_cache_verification():
     print("Running a simple screen for the first time...")
 
     # First call - should make an API request
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     result1 = api.run_simple_screen(universe="SP500", formula="PRICE > 100", as_dataframe=True)
-    first_call_time = time.time() - start_time
+    first_call_time = (time.perf_counter_ns() - start_time) / 1e9
 
     print_result_summary(result1)
-    print(f"First call execution time: {first_call_time:.2f} seconds")
+    print_call_time("First call", first_call_time)
 
     print("\nRunning the same screen again (should use cache)...")
 
     # Second call - should use cache
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     result2 = api.run_simple_screen(universe="SP500", formula="PRICE > 100", as_dataframe=True)
-    second_call_time = time.time() - start_time
+    second_call_time = (time.perf_counter_ns() - start_time) / 1e9
 
     print_result_summary(result2)
-    print(f"Second call execution time: {second_call_time:.2f} seconds")
-    print(f"Speed improvement: {first_call_time / max(second_call_time, 0.001):.1f}x faster")
+    print_call_time("Second call", second_call_time)
+    print_speedup(first_call_time, second_call_time)
 
     # Check if results are identical
     if isinstance(result1, pd.DataFrame) and isinstance(result2, pd.DataFrame):
-        if result1.equals(result2):
+        # Shape, columns and dtypes are cheap to compare; only walk the cells if they match
+        same = (
+            result1.shape == result2.shape
+            and result1.columns.equals(result2.columns)
+            and result1.dtypes.equals(result2.dtypes)
+            and result1.equals(result2)
+        )
+        if same:
             print("\n✅ Results are identical - caching is working correctly!")
         else:
             print("\n❌ Results differ - caching might not be working correctly!")
@@ -1,17 +1,20 @@
 """Integration tests for cache manager."""
 
 import json
+import sqlite3
 import threading
 import time
+from dataclasses import replace
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from zoneinfo import ZoneInfo
 
 import pandas as pd
 import pytest
-import pytz
 
 from p123api_client.cache.config import CacheConfig
-from p123api_client.cache.keys import generate_cache_key
+from p123api_client.cache.decorators import cached_api_call
+from p123api_client.cache.keys import generate_cache_key, generate_cache_key_from_canonical
 from p123api_client.cache.manager import CacheManager
 
 
@@ -193,6 +196,25 @@ class TestCacheManager:
         # Test hit ratio calculation
         assert stats["hit_ratio"] == 1 / 3, "Hit ratio should be 1/3"
 
+    def test_stats_buffered(self, cache_manager, cache_config):
+        """Test hits and misses are written to SQLite in batches."""
+        cache_manager.get("test_endpoint", {"test": "missing"})
+
+        # Nothing written yet; the miss is only buffered
+        with sqlite3.connect(cache_config.db_path) as reader:
+            assert reader.execute("SELECT COUNT(*) FROM cache_statistics").fetchone()[0] == 0
+
+        # Reading the stats flushes the buffer first
+        assert cache_manager.get_stats()["misses"] == 1
+
+        for i in range(CacheManager.STATS_FLUSH_THRESHOLD):
+            cache_manager.get("test_endpoint", {"test": i})
+        with sqlite3.connect(cache_config.db_path) as reader:
+            row = reader.execute(
+                "SELECT misses FROM cache_statistics ORDER BY timestamp DESC LIMIT 1"
+            ).fetchone()
+        assert row[0] == CacheManager.STATS_FLUSH_THRESHOLD + 1
+
     def test_cache_expiration(self, cache_manager):
         """Test cache expiration with a real TTL."""
         endpoint = "test_endpoint"
@@ -254,6 +276,100 @@ class TestCacheManager:
         assert cache_manager.get("endpoint1", {"p": 2}) is None
         assert cache_manager.get("endpoint2", {"p": 1}) == "data3"
 
+    def test_invalidate_matching(self, cache_manager):
+        """Test invalidating entries by their stored parameters."""
+        for universe in ("SP500", "SP1500"):
+            for limit in (10, 20):
+                params = {"universe": universe, "limit": limit}
+                cache_manager.put("endpoint1", params, f"{universe}-{limit}", force_ttl=86400)
+        cache_manager.put("endpoint2", {"universe": "SP500", "limit": 10}, "other")
+
+        # Exact parameters
+        assert cache_manager.invalidate_matching("endpoint1", {"limit": 10, "universe": "SP500"})
+        assert cache_manager.get("endpoint1", {"universe": "SP500", "limit": 10}) is None
+        assert cache_manager.get("endpoint1", {"universe": "SP500", "limit": 20}) == "SP500-20"
+
+        # Predicate over the stored parameters
+        assert cache_manager.invalidate_matching("endpoint1", lambda p: p["universe"] == "SP1500")
+        assert cache_manager.get("endpoint1", {"universe": "SP1500", "limit": 10}) is None
+        assert cache_manager.get("endpoint1", {"universe": "SP1500", "limit": 20}) is None
+        assert cache_manager.get("endpoint1", {"universe": "SP500", "limit": 20}) == "SP500-20"
+        assert cache_manager.get("endpoint2", {"universe": "SP500", "limit": 10}) == "other"
+
+    def test_invalidate_matching_decorated_calls(self, cache_manager):
+        """Test entries cached by the decorator are stored with the params their key hashed."""
+
+        class Ranking:
+            def __init__(self, name):
+                self.name = name
+
+        class API:
+            def __init__(self, manager):
+                self.cache_manager = manager
+                self.calls = 0
+
+            @cached_api_call("decorated")
+            def run(self, universe, ranking=None, options=None):
+                self.calls += 1
+                return f"{universe}-{self.calls}"
+
+        api = API(cache_manager)
+        api.run("SP500", ranking=Ranking("Core"), options={"pit": None, "limit": 5})
+        api.run("SP1500", ranking=Ranking("Core"))
+
+        with sqlite3.connect(cache_manager.config.db_path) as conn:
+            rows = conn.execute(
+                "SELECT key, params_blob FROM cache_entries WHERE endpoint = 'decorated'"
+            ).fetchall()
+        assert len(rows) == 2
+        for key, params_blob in rows:
+            assert key == generate_cache_key_from_canonical("decorated", params_blob)
+
+        match = {"universe": "SP500", "ranking": {"name": "Core"}, "options": {"limit": 5}}
+        assert cache_manager.invalidate_matching("decorated", match)
+        assert api.run("SP500", ranking=Ranking("Core"), options={"pit": None, "limit": 5}) == (
+            "SP500-3"
+        )
+        assert api.run("SP1500", ranking=Ranking("Core")) == "SP1500-2"
+
+    def test_negative_results(self, cache_config):
+        """Test None results are only cached when negative_ttl_seconds is set."""
+
+        class API:
+            def __init__(self, manager):
+                self.cache_manager = manager
+                self.calls = 0
+
+            @cached_api_call("negative")
+            def run(self, universe):
+                self.calls += 1
+                return None if universe == "empty" else {"__negative__": True}
+
+        assert CacheConfig().negative_ttl_seconds == 0
+        manager = CacheManager(config=cache_config)
+        try:
+            api = API(manager)
+            assert api.run("empty") is None
+            assert api.run("empty") is None
+            assert api.calls == 2
+        finally:
+            manager.close()
+
+        config = replace(cache_config, negative_ttl_seconds=30, mem_cache_entries=0)
+        manager = CacheManager(config=config)
+        try:
+            api = API(manager)
+            assert api.run("empty") is None
+            assert api.run("empty") is None
+            assert api.calls == 1
+
+            # A payload shaped like the old dict marker is ordinary data
+            assert api.run("SP500") == {"__negative__": True}
+            assert api.run("SP500") == {"__negative__": True}
+            assert api.calls == 2
+        finally:
+            manager.close()
+
     def test_data_types(self, cache_manager):
         """Test with various data types."""
         endpoint = "test_endpoint"
@@ -291,6 +407,11 @@ class TestCacheManager:
         cache_manager.put(endpoint, {"type": "none"}, None, force_ttl=ttl)
         assert cache_manager.get(endpoint, {"type": "none"}) is None
 
+        # Test raw bytes payload (stored as a BLOB, not stringified)
+        bytes_data = {"__serialized__": True, "data": b"\x80\x05raw\x00bytes"}
+        cache_manager.put(endpoint, {"type": "bytes"}, bytes_data, force_ttl=ttl)
+        assert cache_manager.get(endpoint, {"type": "bytes"}) == bytes_data
+
         # Test DataFrame conversion via dict
         df = pd.DataFrame({"A": [1, 2, 3], "B": ["a", "b", "c"]})
         df_dict = df.to_dict()
@@ -313,6 +434,127 @@ class TestCacheManager:
         assert manager2.get("test", {"id": 123}) == "persistent data"
         manager2.close()
 
+    def test_bulk_transaction(self, cache_manager, cache_config):
+        """Test writes inside bulk() commit together and roll back on error."""
+        endpoint = "test_endpoint"
+
+        with cache_manager.bulk():
+            cache_manager.put(endpoint, {"id": 1}, "first", force_ttl=86400)
+            cache_manager.put(endpoint, {"id": 2}, "second", force_ttl=86400)
+            # Visible on this connection, not yet committed for other readers
+            assert cache_manager.get(endpoint, {"id": 1}) == "first"
+            with sqlite3.connect(cache_config.db_path) as reader:
+                assert reader.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0] == 0
+
+        assert cache_manager.get(endpoint, {"id": 2}) == "second"
+
+        with pytest.raises(RuntimeError):
+            with cache_manager.bulk():
+                cache_manager.put(endpoint, {"id": 3}, "third", force_ttl=86400)
+                raise RuntimeError("abort")
+
+        assert cache_manager.get(endpoint, {"id": 3}) is None
+
+    def test_put_many(self, cache_manager):
+        """Test storing a batch of entries in one call."""
+        endpoint = "test_endpoint"
+        df = pd.DataFrame({"ticker": ["AAPL", "MSFT"], "price": [150.0, 250.0]})
+        entries = [
+            (endpoint, {"id": 1}, {"result": "first"}),
+            (endpoint, {"id": 2}, df),
+            ("other_endpoint", {"id": 1}, [1, 2, 3]),
+        ]
+
+        assert cache_manager.put_many(entries, force_ttl=86400)
+
+        assert cache_manager.get(endpoint, {"id": 1}) == {"result": "first"}
+        pd.testing.assert_frame_equal(cache_manager.get(endpoint, {"id": 2}), df)
+        assert cache_manager.get("other_endpoint", {"id": 1}) == [1, 2, 3]
+
+    def test_memory_layer(self, cache_config):
+        """Test hot entries are served from the in-process LRU in front of SQLite."""
+        manager = CacheManager(config=replace(cache_config, mem_cache_entries=2))
+        try:
+            for i in range(3):
+                manager.put("test_endpoint", {"id": i}, f"data{i}", force_ttl=86400)
+
+            # Remove the rows behind the manager's back; only memory can answer now
+            with sqlite3.connect(cache_config.db_path) as conn:
+                conn.execute("DELETE FROM cache_entries")
+
+            # The oldest entry was evicted, the two most recent are still in memory
+            assert manager.get("test_endpoint", {"id": 0}) is None
+            assert manager.get("test_endpoint", {"id": 1}) == "data1"
+            assert manager.get("test_endpoint", {"id": 2}) == "data2"
+
+            manager.invalidate_endpoint("test_endpoint")
+            assert manager.get("test_endpoint", {"id": 2}) is None
+        finally:
+            manager.close()
+
+    def test_memory_layer_returns_copies(self, cache_config):
+        """Test mutating a value put or returned from memory doesn't change later hits."""
+        manager = CacheManager(config=cache_config)
+        try:
+            df = pd.DataFrame({"ticker": ["AAPL", "MSFT"], "price": [190.5, 410.25]})
+            manager.put("test_endpoint", {"id": 1}, df, force_ttl=86400)
+            df.loc[0, "price"] = 0.0
+
+            first = manager.get("test_endpoint", {"id": 1})
+            assert first.loc[0, "price"] == 190.5
+            first.loc[0, "price"] = -1.0
+            first["extra"] = 1
+
+            second = manager.get("test_endpoint", {"id": 1})
+            assert second is not first
+            assert second.loc[0, "price"] == 190.5
+            assert "extra" not in second.columns
+
+            manager.put("test_endpoint", {"id": 2}, {"rows": [1, 2]}, force_ttl=86400)
+            manager.get("test_endpoint", {"id": 2})["rows"].append(3)
+            assert manager.get("test_endpoint", {"id": 2}) == {"rows": [1, 2]}
+        finally:
+            manager.close()
+
+    def test_write_behind(self, cache_config):
+        """Test queued puts are written together once the batch fills or on close."""
+        config = replace(cache_config, write_batch_size=3, write_flush_interval_ms=60_000)
+        manager = CacheManager(config=config)
+
+        def stored_rows():
+            with sqlite3.connect(cache_config.db_path) as reader:
+                return reader.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+        try:
+            manager.put("test_endpoint", {"id": 1}, "first", force_ttl=86400)
+            manager.put("test_endpoint", {"id": 2}, "second", force_ttl=86400)
+            assert stored_rows() == 0
+            # Queued entries are still served to this process
+            assert manager.get("test_endpoint", {"id": 2}) == "second"
+
+            manager.put("test_endpoint", {"id": 3}, "third", force_ttl=86400)
+            assert stored_rows() == 3
+
+            manager.put("test_endpoint", {"id": 4}, "fourth", force_ttl=86400)
+        finally:
+            manager.close()
+        assert stored_rows() == 4
+
+    def test_close_unregisters_exit_hook(self, cache_config, monkeypatch):
+        """Test each manager registers its own exit flush and close() removes it."""
+        hooks = []
+        monkeypatch.setattr("atexit.register", hooks.append)
+        monkeypatch.setattr("atexit.unregister", hooks.remove)
+
+        first = CacheManager(config=cache_config)
+        second = CacheManager(config=cache_config)
+        assert len(hooks) == 2
+
+        first.close()
+        assert hooks == [second._exit_hook]
+        second.close()
+        assert hooks == []
+
     def test_bypass_cache(self, cache_manager):
         """Test bypassing the cache."""
         endpoint = "test_endpoint"
@@ -347,7 +589,7 @@ class TestCacheManager:
             refresh_time = manager._calculate_next_refresh()
 
             # Convert refresh_time to Eastern for comparison
-            eastern = pytz.timezone("US/Eastern")
+            eastern = ZoneInfo("US/Eastern")
             refresh_time_eastern = refresh_time.astimezone(eastern)
 
             # The refresh time should be at 3 AM Eastern